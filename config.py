@@ -130,3 +130,15 @@ COLOR_REJECTED = '#e74c3c'  # Reddish
 COLOR_AFTERPULSE = '#f1c40f'  # Yellowish
 COLOR_REJECTED_AFTERPULSE = '#9b59b6'  # Purple
 COLOR_WAVEFORM_OVERLAY = '#1E90FF'  # DodgerBlue
+
+# ============================================================================
+# PLOT RENDERING
+# ============================================================================
+# Render the temporal distribution points with datashader (optional dependency)
+# instead of a Matplotlib scatter. Aggregates per pixel, so cost does not grow with N.
+USE_DATASHADER_SCATTER = False
+
+# Above this many peaks the temporal distribution is drawn as one marker per
+# occupied grid cell (sized by count) instead of one marker per peak.
+# Metrics are always computed on the raw peaks.
+TEMPORAL_DENSITY_MIN_POINTS = 50000
@@ -103,6 +103,9 @@ class AnalysisController:
             # Save to cache
             self.cache.save(cache_key, self.results, params)
         
+        # Contiguous per-category amplitude arrays shared by the plot windows
+        self.results.pack_amplitudes()
+        
         # Reset navigation indices
         self.current_accepted_idx = 0
         self.current_rejected_idx = 0
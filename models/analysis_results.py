@@ -2,7 +2,7 @@
 Data structures for analysis results.
 """
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 from pathlib import Path
 
@@ -19,6 +19,10 @@ class WaveformResult:
     peak_rejection_reasons: Dict[int, str] = field(default_factory=dict)  # Maps peak index to rejection reason
 
 
+# Categories with a stacked (structure-of-arrays) copy, see AnalysisResults.stacked
+STACKED_CATEGORIES = ('accepted', 'afterpulse', 'rejected')
+
+
 @dataclass
 class AnalysisResults:
     """Container for all analysis results."""
@@ -35,11 +39,86 @@ class AnalysisResults:
     max_dist_high: float = 0.0
     # Note: afterpulse_low/high removed - zone calculation no longer used
     
+    # Stacked (structure-of-arrays) views, built on first use:
+    # category -> (count, amplitudes matrix or None, t_half array)
+    _stacks: Dict[str, tuple] = field(default_factory=dict, init=False, repr=False)
+    _first_peak_idx: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _first_peak_count: int = field(default=-1, init=False, repr=False)
+    
     def __post_init__(self):
         """Ensure favorites_results exists for backward compatibility."""
         if not hasattr(self, 'favorites_results'):
             self.favorites_results = []
     
+    def __getstate__(self):
+        """Leave the stacked arrays out of pickles; they are rebuilt on demand."""
+        state = self.__dict__.copy()
+        for key in ('_stacks', '_first_peak_idx', '_first_peak_count'):
+            state.pop(key, None)
+        return state
+    
+    def __setstate__(self, state):
+        """Restore a pickle (also those written before the stacked arrays existed)."""
+        self.__dict__.update(state)
+        self._stacks = {}
+    
+    def stacked(self, category: str) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        Structure-of-arrays view of one category of results.
+        
+        The amplitudes of the category are stacked once into a contiguous
+        (n_results, n_samples) array, and each result's amplitudes become a
+        read-only row view of it, so the data is not held twice. The arrays
+        are rebuilt if the number of results in the category changes.
+        
+        Args:
+            category: 'accepted', 'afterpulse' or 'rejected'
+            
+        Returns:
+            Tuple of (amplitudes, t_half). amplitudes is None if the waveforms
+            of the category do not all have the same length.
+        """
+        results = getattr(self, f"{category}_results")
+        cached = self._stacks.get(category)
+        if cached is not None and cached[0] == len(results):
+            return cached[1], cached[2]
+        
+        amplitudes = None
+        if len({len(r.amplitudes) for r in results}) == 1:
+            amplitudes = np.stack([r.amplitudes for r in results])
+            amplitudes.setflags(write=False)
+            for r, row in zip(results, amplitudes):
+                r.amplitudes = row
+        t_half = np.fromiter((r.t_half for r in results), dtype=np.float64, count=len(results))
+        
+        self._stacks[category] = (len(results), amplitudes, t_half)
+        return amplitudes, t_half
+    
+    def pack_amplitudes(self):
+        """Build the stacked arrays of every category (see stacked)."""
+        for category in STACKED_CATEGORIES:
+            self.stacked(category)
+    
+    @property
+    def amplitudes_matrix(self) -> Optional[np.ndarray]:
+        """
+        Accepted waveform amplitudes as one contiguous (n_accepted, n_samples) array.
+        
+        None if the accepted waveforms do not all have the same length.
+        """
+        return self.stacked('accepted')[0]
+    
+    @property
+    def first_peak_idx(self) -> np.ndarray:
+        """Index of the first valid peak of each accepted waveform (-1 if it has none)."""
+        if self._first_peak_count != len(self.accepted_results):
+            self._first_peak_idx = np.array(
+                [r.peaks[0] if len(r.peaks) else -1 for r in self.accepted_results],
+                dtype=np.int32
+            )
+            self._first_peak_count = len(self.accepted_results)
+        return self._first_peak_idx
+    
     def get_accepted_count(self) -> int:
         """Get number of accepted waveforms."""
         return len(self.accepted_results)
@@ -90,3 +169,6 @@ class AnalysisResults:
         self.afterpulse_results.clear()
         self.favorites_results.clear()
         self.total_peaks = 0
+        self._stacks = {}
+        self._first_peak_idx = None
+        self._first_peak_count = -1
@@ -4,8 +4,15 @@ Pulse analysis utilities for advanced SiPM characterization.
 import numpy as np
 from scipy.optimize import curve_fit
 from scipy.stats import norm
-from typing import Tuple, List, Dict
-from sklearn.decomposition import PCA
+from typing import Tuple, List, Dict, TYPE_CHECKING
+
+from models.sipm_jit import NUMBA_AVAILABLE
+
+if NUMBA_AVAILABLE:
+    from models.sipm_jit import pulse_shape_params_jit, pulse_shape_params_batch_jit
+
+if TYPE_CHECKING:
+    from sklearn.decomposition import PCA
 
 
 def calculate_rise_time(amplitudes: np.ndarray, time_array: np.ndarray, 
@@ -116,6 +123,89 @@ def calculate_fwhm(amplitudes: np.ndarray, time_array: np.ndarray,
     return t_right - t_left
 
 
+def calculate_pulse_shape_params(amplitudes: np.ndarray, time_array: np.ndarray,
+                                 peak_idx: int, baseline: float) -> Tuple[float, float, float]:
+    """
+    Calculate rise time, fall time and FWHM of a pulse in one pass per side.
+    
+    Gives the same crossings as calculate_rise_time, calculate_fall_time and
+    calculate_fwhm: a running maximum before the peak and a running minimum
+    after it are searched for the 10%, 50% and 90% levels. Uses the compiled
+    kernel from models.sipm_jit when Numba is available.
+    
+    Args:
+        amplitudes: Waveform amplitudes
+        time_array: Time values
+        peak_idx: Index of peak maximum
+        baseline: Baseline value
+        
+    Returns:
+        Tuple of (rise_time, fall_time, fwhm) in seconds (NaN where undefined)
+    """
+    if NUMBA_AVAILABLE:
+        return pulse_shape_params_jit(
+            np.ascontiguousarray(amplitudes, dtype=np.float64),
+            np.ascontiguousarray(time_array, dtype=np.float64),
+            int(peak_idx), float(baseline)
+        )
+    
+    peak_amp = amplitudes[peak_idx]
+    amp_range = peak_amp - baseline
+    levels = baseline + np.array([0.1, 0.5, 0.9]) * amp_range
+    
+    # First index at or above each level before the peak
+    rising = np.maximum.accumulate(amplitudes[:peak_idx]) if peak_idx > 0 else np.empty(0)
+    left_idx = np.searchsorted(rising, levels, side='left')
+    
+    # First index at or below each level from the peak on (running minimum, negated to ascend)
+    falling = -np.minimum.accumulate(amplitudes[peak_idx:])
+    right_idx = np.searchsorted(falling, -levels, side='left')
+    
+    left_ok = left_idx < len(rising)
+    right_ok = right_idx < len(falling)
+    t_left = time_array[np.where(left_ok, left_idx, 0)]
+    t_right = time_array[peak_idx + np.where(right_ok, right_idx, 0)]
+    
+    rise_time = t_left[2] - t_left[0] if left_ok[0] and left_ok[2] else np.nan
+    fall_time = t_right[0] - t_right[2] if right_ok[0] and right_ok[2] else np.nan
+    fwhm = t_right[1] - t_left[1] if left_ok[1] and right_ok[1] else np.nan
+    
+    return rise_time, fall_time, fwhm
+
+
+def extract_pulse_params_batch(amp_matrix: np.ndarray, peak_indices: np.ndarray,
+                               baseline: float, time_array: np.ndarray) -> np.ndarray:
+    """
+    Calculate rise time, fall time and FWHM for a stack of pulses.
+    
+    With Numba the rows are processed in parallel by a compiled kernel;
+    otherwise calculate_pulse_shape_params is applied row by row.
+    
+    Args:
+        amp_matrix: Waveform amplitudes, shape (n_waveforms, n_samples)
+        peak_indices: Index of the peak maximum in each row
+        baseline: Baseline value
+        time_array: Time values (n_samples)
+        
+    Returns:
+        Array of shape (n_waveforms, 3) with (rise_time, fall_time, fwhm) in
+        seconds per row (NaN where undefined)
+    """
+    amp_matrix = np.ascontiguousarray(amp_matrix, dtype=np.float64)
+    peak_indices = np.asarray(peak_indices, dtype=np.intp)
+    
+    if NUMBA_AVAILABLE:
+        return pulse_shape_params_batch_jit(
+            amp_matrix, peak_indices,
+            np.ascontiguousarray(time_array, dtype=np.float64), float(baseline)
+        )
+    
+    shape_params = np.full((len(amp_matrix), 3), np.nan)
+    for i, (amplitudes, peak_idx) in enumerate(zip(amp_matrix, peak_indices)):
+        shape_params[i] = calculate_pulse_shape_params(amplitudes, time_array, peak_idx, baseline)
+    return shape_params
+
+
 def fit_exponential_recovery(delta_t: np.ndarray, amplitudes: np.ndarray) -> Tuple[float, float, np.ndarray]:
     """
     Fit exponential decay to recovery time data.
@@ -188,7 +278,7 @@ def extract_pulse_template(waveforms: List[np.ndarray], peak_indices: List[int],
     return template
 
 
-def perform_pulse_pca(pulse_features: np.ndarray) -> Tuple[np.ndarray, PCA]:
+def perform_pulse_pca(pulse_features: np.ndarray) -> Tuple[np.ndarray, "PCA"]:
     """
     Perform PCA on pulse shape features.
     
@@ -198,6 +288,9 @@ def perform_pulse_pca(pulse_features: np.ndarray) -> Tuple[np.ndarray, PCA]:
     Returns:
         Tuple of (transformed_data, pca_model)
     """
+    # scikit-learn is heavy to import and only needed here
+    from sklearn.decomposition import PCA
+    
     pca = PCA(n_components=2)
     transformed = pca.fit_transform(pulse_features)
     
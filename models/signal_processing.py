@@ -5,6 +5,8 @@ import numpy as np
 from dataclasses import dataclass
 from typing import Tuple
 
+from models.sipm_jit import classify_quadrants, LABEL_DCR, LABEL_AP, LABEL_XT, LABEL_AP_XT
+
 @dataclass
 class SiPMMetrics:
     """Container for SiPM characterization metrics."""
@@ -29,6 +31,7 @@ class SiPMMetrics:
     time_threshold: float = 0.0
     
     # Masks for visualization
+    labels: np.ndarray = None  # int8 quadrant label per event (see models.sipm_jit)
     dcr_mask: np.ndarray = None
     crosstalk_mask: np.ndarray = None
     afterpulse_mask: np.ndarray = None
@@ -50,7 +53,9 @@ class SiPMAnalyzer:
         self.amp_threshold = amplitude_threshold_mV
         self.time_threshold = time_threshold_s
     
-    def analyze(self, delta_t: np.ndarray, amplitudes_mV: np.ndarray) -> SiPMMetrics:
+    def analyze(self, delta_t: np.ndarray, amplitudes_mV: np.ndarray,
+                amp_threshold_mV: float = None, time_threshold_s: float = None,
+                labels_out: np.ndarray = None) -> SiPMMetrics:
         """
         Analyze SiPM characteristics using threshold-based quadrant classification.
         
@@ -63,13 +68,19 @@ class SiPMAnalyzer:
         Args:
             delta_t: Time differences between consecutive peaks (s)
             amplitudes_mV: Peak amplitudes (mV)
+            amp_threshold_mV: Amplitude threshold for this call (defaults to the instance value)
+            time_threshold_s: Time threshold for this call (defaults to the instance value)
+            labels_out: Optional preallocated int8 buffer for the quadrant labels
             
         Returns:
             SiPMMetrics with calculated percentages
         """
+        amp_threshold = self.amp_threshold if amp_threshold_mV is None else amp_threshold_mV
+        time_threshold = self.time_threshold if time_threshold_s is None else time_threshold_s
+        
         metrics = SiPMMetrics()
-        metrics.amplitude_threshold = self.amp_threshold
-        metrics.time_threshold = self.time_threshold
+        metrics.amplitude_threshold = amp_threshold
+        metrics.time_threshold = time_threshold
         
         total_events = len(delta_t)
         metrics.total_events = total_events
@@ -77,30 +88,31 @@ class SiPMAnalyzer:
         if total_events == 0:
             return metrics
         
-        # Classify events into quadrants
-        # Bottom-Right: DCR (long time, low amplitude)
-        dcr_mask = (delta_t >= self.time_threshold) & (amplitudes_mV < self.amp_threshold)
-        
-        # Bottom-Left: Afterpulses (short time, low amplitude)
-        ap_mask = (delta_t < self.time_threshold) & (amplitudes_mV < self.amp_threshold)
-        
-        # Top-Right: Crosstalk (long time, high amplitude)
-        xt_mask = (delta_t >= self.time_threshold) & (amplitudes_mV >= self.amp_threshold)
-        
-        # Top-Left: Afterpulse + Crosstalk (short time, high amplitude)
-        ap_xt_mask = (delta_t < self.time_threshold) & (amplitudes_mV >= self.amp_threshold)
+        # Classify events into quadrants in a single pass:
+        # - Bottom-Right: DCR (long time, low amplitude)
+        # - Bottom-Left: Afterpulses (short time, low amplitude)
+        # - Top-Right: Crosstalk (long time, high amplitude)
+        # - Top-Left: Afterpulse + Crosstalk (short time, high amplitude)
+        labels = classify_quadrants(
+            delta_t, amplitudes_mV, amp_threshold, time_threshold, out=labels_out
+        )
+        dcr_mask = labels == LABEL_DCR
+        ap_mask = labels == LABEL_AP
+        xt_mask = labels == LABEL_XT
+        ap_xt_mask = labels == LABEL_AP_XT
         
-        # Store masks
+        # Store labels and masks
+        metrics.labels = labels
         metrics.dcr_mask = dcr_mask
         metrics.afterpulse_mask = ap_mask
         metrics.crosstalk_mask = xt_mask
         metrics.crosstalk_afterpulse_mask = ap_xt_mask
         
-        # Count events
-        metrics.dcr_count = np.sum(dcr_mask)
-        metrics.afterpulse_count = np.sum(ap_mask)
-        metrics.crosstalk_count = np.sum(xt_mask)
-        metrics.crosstalk_afterpulse_count = np.sum(ap_xt_mask)
+        # Count events (count_nonzero avoids summing booleans as integers)
+        metrics.dcr_count = np.count_nonzero(dcr_mask)
+        metrics.afterpulse_count = np.count_nonzero(ap_mask)
+        metrics.crosstalk_count = np.count_nonzero(xt_mask)
+        metrics.crosstalk_afterpulse_count = np.count_nonzero(ap_xt_mask)
         
         # Calculate percentages (over total events)
         metrics.afterpulse_pct = (metrics.afterpulse_count / total_events) * 100
@@ -119,7 +131,8 @@ class SiPMAnalyzer:
             
             # Method 2: Average rate = 1 / mean_interval
             # This gives the rate based on the typical interval between events
-            mean_interval_dcr = np.mean(dcr_intervals)
+            # (same sum as above, so the DCR intervals are only reduced once)
+            mean_interval_dcr = total_time_dcr / metrics.dcr_count
             if mean_interval_dcr > 0:
                 metrics.dcr_rate_avg_hz = 1.0 / mean_interval_dcr
         
@@ -0,0 +1,308 @@
+"""
+Compiled kernels for SiPM peak aggregation, classification, pulse shape,
+charge integration and display decimation.
+
+Numba is optional: when it is not installed every kernel falls back to an
+equivalent vectorized NumPy implementation.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def flatten_peaks(results):
+    """
+    Flatten the valid peaks of several results into contiguous arrays.
+
+    Args:
+        results: List of WaveformResult objects
+
+    Returns:
+        Tuple of (t_halves, peak_offsets, peak_indices_flat, amplitudes_flat).
+        Peaks of result i live in peak_offsets[i]:peak_offsets[i + 1].
+    """
+    n_results = len(results)
+    # Empty peak lists are stored as float arrays
+    peak_lists = [np.asarray(res.peaks, dtype=np.intp) for res in results]
+    
+    peak_offsets = np.zeros(n_results + 1, dtype=np.int64)
+    peak_offsets[1:] = np.cumsum([peaks.size for peaks in peak_lists])
+    total_peaks = int(peak_offsets[-1])
+    
+    # Preallocate the flat arrays and fill them with a running cursor
+    t_halves = np.empty(n_results, dtype=np.float64)
+    peak_indices_flat = np.empty(total_peaks, dtype=np.int64)
+    amplitudes_flat = np.empty(total_peaks, dtype=np.float64)
+    
+    for i, (res, peaks) in enumerate(zip(results, peak_lists)):
+        start, end = peak_offsets[i], peak_offsets[i + 1]
+        t_halves[i] = res.t_half
+        peak_indices_flat[start:end] = peaks
+        amplitudes_flat[start:end] = res.amplitudes[peaks]
+    
+    return t_halves, peak_offsets, peak_indices_flat, amplitudes_flat
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _collect_global_peaks_jit(t_halves, peak_offsets, peak_indices_flat,
+                                  amplitudes_flat, sample_time, window_time):
+        n = peak_indices_flat.size
+        t_out = np.empty(n)
+        a_out = np.empty(n)
+        k = 0
+        for i in range(t_halves.size):
+            t0 = t_halves[i] - window_time / 2
+            for j in range(peak_offsets[i], peak_offsets[i + 1]):
+                t_out[k] = t0 + peak_indices_flat[j] * sample_time
+                a_out[k] = amplitudes_flat[j]
+                k += 1
+        return t_out[:k], a_out[:k]
+
+
+def collect_global_peaks(t_halves, peak_offsets, peak_indices_flat, amplitudes_flat,
+                         sample_time, window_time):
+    """
+    Convert flattened peak indices into global times.
+
+    Args:
+        t_halves: Trigger time of each result (s)
+        peak_offsets: CSR-style offsets into the flat peak arrays
+        peak_indices_flat: Sample index of every peak
+        amplitudes_flat: Amplitude of every peak (V)
+        sample_time: Time between samples (s)
+        window_time: Acquisition window length (s)
+
+    Returns:
+        Tuple of (global_times, amplitudes) in result order (unsorted)
+    """
+    if NUMBA_AVAILABLE:
+        return _collect_global_peaks_jit(t_halves, peak_offsets, peak_indices_flat,
+                                         amplitudes_flat, sample_time, window_time)
+
+    counts = np.diff(peak_offsets)
+    t_start = np.repeat(t_halves - window_time / 2, counts)
+    return t_start + peak_indices_flat * sample_time, amplitudes_flat.copy()
+
+
+# Quadrant labels written by classify_quadrants (-1: unclassified, e.g. NaN input)
+LABEL_DCR = 0       # long time, low amplitude
+LABEL_AP = 1        # short time, low amplitude
+LABEL_XT = 2        # long time, high amplitude
+LABEL_AP_XT = 3     # short time, high amplitude
+LABEL_NONE = -1
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _classify_quadrants_jit(delta_t, amplitudes, amp_threshold, time_threshold, out):
+        for i in range(delta_t.size):
+            d = delta_t[i]
+            a = amplitudes[i]
+            # Explicit comparisons on both sides so NaNs fall in no quadrant
+            # (fastmath is left off for the same reason)
+            if a < amp_threshold:
+                if d >= time_threshold:
+                    out[i] = 0
+                elif d < time_threshold:
+                    out[i] = 1
+                else:
+                    out[i] = -1
+            elif a >= amp_threshold:
+                if d >= time_threshold:
+                    out[i] = 2
+                elif d < time_threshold:
+                    out[i] = 3
+                else:
+                    out[i] = -1
+            else:
+                out[i] = -1
+        return out
+
+
+def classify_quadrants(delta_t, amplitudes, amp_threshold, time_threshold, out=None):
+    """
+    Label every event with its SiPM threshold quadrant in a single pass.
+    
+    Args:
+        delta_t: Time differences between consecutive peaks (s)
+        amplitudes: Peak amplitudes (same units as amp_threshold)
+        amp_threshold: Amplitude threshold
+        time_threshold: Time threshold (s)
+        out: Optional int8 array of the same length to write the labels into
+        
+    Returns:
+        int8 array with LABEL_DCR, LABEL_AP, LABEL_XT, LABEL_AP_XT or LABEL_NONE
+    """
+    if out is None:
+        out = np.empty(len(delta_t), dtype=np.int8)
+    
+    if NUMBA_AVAILABLE:
+        return _classify_quadrants_jit(
+            np.ascontiguousarray(delta_t, dtype=np.float64),
+            np.ascontiguousarray(amplitudes, dtype=np.float64),
+            float(amp_threshold), float(time_threshold), out
+        )
+    
+    # Label = 2 * high + early, matching the LABEL_* values
+    high = amplitudes >= amp_threshold
+    early = delta_t < time_threshold
+    np.left_shift(high, 1, out=out, casting='unsafe')
+    out |= early
+    out[np.isnan(delta_t) | np.isnan(amplitudes)] = LABEL_NONE
+    return out
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def pulse_shape_params_jit(amplitudes, time_array, peak_idx, baseline):
+        """
+        Compiled version of models.pulse_analysis.calculate_pulse_shape_params.
+        
+        Scans once to the left of the peak for the first samples at or above the
+        10/50/90 % levels and once to the right for the first at or below them.
+        """
+        amp_range = amplitudes[peak_idx] - baseline
+        level_10 = baseline + 0.1 * amp_range
+        level_50 = baseline + 0.5 * amp_range
+        level_90 = baseline + 0.9 * amp_range
+        
+        left_10 = left_50 = left_90 = -1
+        for i in range(peak_idx):
+            a = amplitudes[i]
+            if left_10 < 0 and a >= level_10:
+                left_10 = i
+            if left_50 < 0 and a >= level_50:
+                left_50 = i
+            if left_90 < 0 and a >= level_90:
+                left_90 = i
+            if left_10 >= 0 and left_50 >= 0 and left_90 >= 0:
+                break
+        
+        right_10 = right_50 = right_90 = -1
+        for i in range(peak_idx, amplitudes.size):
+            a = amplitudes[i]
+            if right_90 < 0 and a <= level_90:
+                right_90 = i
+            if right_50 < 0 and a <= level_50:
+                right_50 = i
+            if right_10 < 0 and a <= level_10:
+                right_10 = i
+            if right_10 >= 0 and right_50 >= 0 and right_90 >= 0:
+                break
+        
+        rise_time = np.nan
+        fall_time = np.nan
+        fwhm = np.nan
+        if left_10 >= 0 and left_90 >= 0:
+            rise_time = time_array[left_90] - time_array[left_10]
+        if right_10 >= 0 and right_90 >= 0:
+            fall_time = time_array[right_10] - time_array[right_90]
+        if left_50 >= 0 and right_50 >= 0:
+            fwhm = time_array[right_50] - time_array[left_50]
+        return rise_time, fall_time, fwhm
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, nogil=True)
+    def pulse_shape_params_batch_jit(amp_matrix, peak_indices, time_array, baseline):
+        """
+        Run pulse_shape_params_jit over every row of a (n_waveforms, n_samples)
+        amplitude matrix, spreading the rows across threads.
+        
+        Returns an (n_waveforms, 3) array of (rise, fall, fwhm).
+        """
+        n_waveforms = amp_matrix.shape[0]
+        out = np.empty((n_waveforms, 3), dtype=np.float64)
+        for i in prange(n_waveforms):
+            rise_time, fall_time, fwhm = pulse_shape_params_jit(
+                amp_matrix[i], time_array, peak_indices[i], baseline
+            )
+            out[i, 0] = rise_time
+            out[i, 1] = fall_time
+            out[i, 2] = fwhm
+        return out
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, nogil=True)
+    def min_max_segments_jit(amplitudes, t_start, sample_time, bucket, x_scale, y_scale, out):
+        """
+        Min/max-decimate every row of an (n_waveforms, n_samples) amplitude
+        matrix and write the display points into out (n_waveforms, n_kept, 2).
+        
+        Each bucket of samples keeps its minimum and maximum (in time order,
+        first occurrence on ties), plus the same for the incomplete tail; a
+        bucket of 1 keeps every sample. x = (t_start[i] + j * sample_time) *
+        x_scale, y = amplitude * y_scale. Rows are spread across threads.
+        """
+        n_rows, n = amplitudes.shape
+        for i in prange(n_rows):
+            row = amplitudes[i]
+            t0 = t_start[i]
+            if bucket == 1:
+                for j in range(n):
+                    out[i, j, 0] = (t0 + j * sample_time) * x_scale
+                    out[i, j, 1] = row[j] * y_scale
+                continue
+            
+            k = 0
+            for start in range(0, n, bucket):
+                stop = min(start + bucket, n)
+                i_min = start
+                i_max = start
+                for j in range(start + 1, stop):
+                    if row[j] < row[i_min]:
+                        i_min = j
+                    if row[j] > row[i_max]:
+                        i_max = j
+                first = min(i_min, i_max)
+                second = max(i_min, i_max)
+                out[i, k, 0] = (t0 + first * sample_time) * x_scale
+                out[i, k, 1] = row[first] * y_scale
+                out[i, k + 1, 0] = (t0 + second * sample_time) * x_scale
+                out[i, k + 1, 1] = row[second] * y_scale
+                k += 2
+        return out
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, nogil=True)
+    def _integrate_above_jit(flat, offsets, threshold, out):
+        # No fastmath: sums match the NumPy fallback up to summation order
+        for i in prange(offsets.size - 1):
+            total = 0.0
+            for j in range(offsets[i], offsets[i + 1]):
+                v = flat[j]
+                if v > threshold:
+                    total += v - threshold
+            out[i] = total
+        return out
+
+
+def integrate_above(flat, offsets, threshold):
+    """
+    Integrate every segment of a flat buffer above a threshold.
+    
+    Args:
+        flat: 1D float64 buffer with the concatenated samples
+        offsets: (n_segments + 1,) int64 offsets; segment i is flat[offsets[i]:offsets[i + 1]]
+        threshold: Samples are summed as (x - threshold) where x > threshold
+        
+    Returns:
+        (n_segments,) float64 array of sums (0.0 for segments that never exceed it)
+    """
+    if NUMBA_AVAILABLE:
+        out = np.empty(len(offsets) - 1, dtype=np.float64)
+        return _integrate_above_jit(
+            np.ascontiguousarray(flat, dtype=np.float64),
+            np.ascontiguousarray(offsets, dtype=np.int64),
+            float(threshold), out
+        )
+    
+    clipped = np.maximum(flat - threshold, 0.0)
+    return np.add.reduceat(clipped, offsets[:-1])
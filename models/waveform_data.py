@@ -105,28 +105,31 @@ class WaveformData:
                 
                 print(f"Global Scale: {self.global_min_amp*1000:.2f}mV to {self.global_max_amp*1000:.2f}mV")
         else:
-            # Sequential for small datasets
-            min_vals = []
-            max_vals = []
-            self.all_max_times = []
+            # Thread pool for small datasets (I/O bound, no process start-up cost)
+            from concurrent.futures import ThreadPoolExecutor
+            import os
+            from config import WINDOW_TIME, NUM_POINTS
+            original_sample_time = WINDOW_TIME / NUM_POINTS
             
-            for wf_file in self.waveform_files:
+            def load_stats(wf_file):
                 try:
                     t_half, amplitudes = read_waveform_file(wf_file)
-                    
-                    min_vals.append(np.min(amplitudes))
-                    max_vals.append(np.max(amplitudes))
-                    
-                    from config import WINDOW_TIME, NUM_POINTS
-                    original_sample_time = WINDOW_TIME / NUM_POINTS
                     max_idx = np.argmax(amplitudes)
                     time_rel = (max_idx * original_sample_time) - (WINDOW_TIME / 2)
-                    self.all_max_times.append(time_rel)
-                    
+                    return np.min(amplitudes), amplitudes[max_idx], time_rel
                 except WaveformError as e:
                     print(f"Skipping {wf_file}: {e}")
                 except Exception as e:
                     print(f"Unexpected error reading {wf_file}: {e}")
+                return None
+            
+            num_workers = min(16, (os.cpu_count() or 1) * 2)
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                results = [r for r in executor.map(load_stats, self.waveform_files) if r is not None]
+            
+            min_vals = [r[0] for r in results]
+            max_vals = [r[1] for r in results]
+            self.all_max_times = [r[2] for r in results]
             
             if min_vals and max_vals:
                 self.global_min_amp = min(min_vals)
@@ -7,14 +7,107 @@ import numpy as np
 from pathlib import Path
 from typing import Tuple, Dict, Any
 from datetime import datetime
+from functools import lru_cache
 
 from utils.exceptions import WaveformError
 from config import SAMPLE_TIME, WINDOW_TIME
 
+# Binary sidecar written next to each waveform text file (<name>.txt.bin).
+# Layout: int64 [source mtime_ns, source size] followed by float64 [t_half, amplitudes...]
+BINARY_CACHE_SUFFIX = ".bin"
+
+# Number of parsed waveforms kept in memory by read_waveform_file
+WAVEFORM_CACHE_SIZE = 4096
+
+
+def _read_binary_cache(cache_path: Path, mtime_ns: int, size: int) -> Tuple[float, np.ndarray]:
+    """Return cached (t_half, amplitudes) if the sidecar matches the source file, else None."""
+    try:
+        with open(cache_path, 'rb') as f:
+            header = np.fromfile(f, dtype=np.int64, count=2)
+            if header.size != 2 or header[0] != mtime_ns or header[1] != size:
+                return None
+            data = np.fromfile(f, dtype=np.float64)
+    except (OSError, ValueError):
+        return None
+    
+    if data.size < 2:
+        return None
+    return float(data[0]), data[1:]
+
+
+def _write_binary_cache(cache_path: Path, mtime_ns: int, size: int, t_half: float, amplitudes: np.ndarray):
+    """Write the binary sidecar atomically; failures (e.g. read-only data dirs) are ignored."""
+    import os
+    import threading
+    
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.array([mtime_ns, size], dtype=np.int64).tofile(f)
+            np.array([t_half], dtype=np.float64).tofile(f)
+            np.asarray(amplitudes, dtype=np.float64).tofile(f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=WAVEFORM_CACHE_SIZE)
+def _load_waveform(file_path: Path, mtime_ns: int, size: int) -> Tuple[float, np.ndarray]:
+    """
+    Load a waveform from its binary sidecar or text file.
+    
+    Memoized on (path, mtime_ns, size), so an edited file is reloaded. The
+    returned array is shared between callers and therefore read-only.
+    """
+    import mmap
+    import warnings
+
+    cache_path = file_path.with_name(file_path.name + BINARY_CACHE_SUFFIX)
+    
+    cached = _read_binary_cache(cache_path, mtime_ns, size)
+    if cached is not None:
+        t_half, amplitudes = cached
+    else:
+        try:
+            # Parse straight from the mapped bytes: no per-line str objects,
+            # np.fromstring converts the whole amplitude column in C
+            with open(file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                first_nl = mm.find(b'\n')
+                second_nl = mm.find(b'\n', first_nl + 1) if first_nl >= 0 else -1
+                if second_nl < 0:
+                    raise WaveformError("File too short")
+                
+                t_half = float(mm[:first_nl])
+                with warnings.catch_warnings():
+                    # Older NumPy only warns (and truncates) on malformed data
+                    warnings.simplefilter("error", DeprecationWarning)
+                    amplitudes = np.fromstring(mm[second_nl + 1:], dtype=np.float64, sep='\n')
+
+            if amplitudes.size == 0:
+                raise WaveformError("File too short")
+        except (IOError, ValueError, DeprecationWarning) as e:
+            raise WaveformError(f"Failed to read waveform file: {e}")
+        
+        _write_binary_cache(cache_path, mtime_ns, size, t_half, amplitudes)
+    
+    amplitudes.setflags(write=False)
+    return t_half, amplitudes
+
+
 def read_waveform_file(file_path: Path) -> Tuple[float, np.ndarray]:
     """
     Read a single waveform file.
     
+    The first read parses the text file and stores a binary sidecar next to it;
+    later reads load the sidecar with np.fromfile while the source is unchanged.
+    Parsed waveforms are also kept in an in-memory LRU cache, so reopening a
+    view over the same files does no I/O. The returned amplitudes are read-only.
+    
     Args:
         file_path: Path to waveform file
         
@@ -24,19 +117,14 @@ def read_waveform_file(file_path: Path) -> Tuple[float, np.ndarray]:
     Raises:
         WaveformError: If file cannot be read or parsed
     """
+    file_path = Path(file_path)
+    
     try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-        
-        if len(lines) < 3:
-            raise WaveformError("File too short")
-            
-        t_half = float(lines[0].strip())
-        amplitudes = np.array([float(line.strip()) for line in lines[2:] if line.strip()])
-        
-        return t_half, amplitudes
-    except (IOError, ValueError) as e:
+        source_stat = file_path.stat()
+    except OSError as e:
         raise WaveformError(f"Failed to read waveform file: {e}")
+    
+    return _load_waveform(file_path, source_stat.st_mtime_ns, source_stat.st_size)
 
 def export_to_csv(data: list, headers: list, filepath: str):
     """
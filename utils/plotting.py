@@ -1,11 +1,12 @@
 """
 Plotting utilities.
 """
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import numpy as np
 from tkinter import filedialog
 from datetime import datetime
 
-def save_figure(fig: plt.Figure, default_prefix: str = "plot"):
+def save_figure(fig: Figure, default_prefix: str = "plot"):
     """
     Save a matplotlib figure to a file with user dialog.
     
@@ -55,3 +56,142 @@ def setup_plot_style(ax, title: str = None, xlabel: str = None, ylabel: str = No
         ax.set_ylabel(ylabel, fontsize=10)
     
     ax.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
+
+
+def downsample_indices(amplitudes, target_points: int = 2400):
+    """
+    Indices kept by min/max decimation for each row of a waveform stack.
+    
+    Each bucket keeps the positions of its minimum and maximum sample (in time
+    order), so peaks stay visible in the rendered envelope.
+    
+    Args:
+        amplitudes: Amplitude array, 1D or (n_waveforms, n_samples)
+        target_points: Maximum number of points to keep per row (approximately)
+        
+    Returns:
+        (n_waveforms, n_kept) index array; every row keeps the same number of samples
+    """
+    a = np.atleast_2d(amplitudes)
+    n_rows, n = a.shape
+    if n <= target_points:
+        return np.broadcast_to(np.arange(n), (n_rows, n))
+    
+    bucket = int(np.ceil(n / (target_points // 2)))
+    n_full = (n // bucket) * bucket
+    blocks = a[:, :n_full].reshape(n_rows, -1, bucket)
+    base = np.arange(blocks.shape[1]) * bucket
+    i_min = base + blocks.argmin(axis=2)
+    i_max = base + blocks.argmax(axis=2)
+    idx = np.stack([np.minimum(i_min, i_max), np.maximum(i_min, i_max)], axis=2).reshape(n_rows, -1)
+    
+    # Remaining samples that do not fill a whole bucket
+    if n_full < n:
+        tail = a[:, n_full:]
+        tail_idx = n_full + np.sort(np.column_stack([tail.argmin(axis=1), tail.argmax(axis=1)]), axis=1)
+        idx = np.concatenate([idx, tail_idx], axis=1)
+    
+    return idx
+
+
+def build_segments(amplitudes, t_start, sample_time: float, target_points: int = 2400,
+                   x_scale: float = 1e6, y_scale: float = 1000):
+    """
+    Display segments for a stack of waveforms, min/max decimated per row.
+    
+    Same points as downsample_indices, computed by a compiled kernel that
+    decimates and scales in one pass over the rows (in parallel) when Numba
+    is available.
+    
+    Args:
+        amplitudes: (n_waveforms, n_samples) amplitude array (V)
+        t_start: Time of the first sample of each waveform (s), scalar or (n_waveforms,)
+        sample_time: Time between samples (s)
+        target_points: Maximum number of points to keep per row (approximately)
+        x_scale: Factor applied to the times (default: s -> µs)
+        y_scale: Factor applied to the amplitudes (default: V -> mV)
+        
+    Returns:
+        (n_waveforms, n_kept, 2) array of (time, amplitude) points
+    """
+    from models.sipm_jit import NUMBA_AVAILABLE
+    
+    a = np.atleast_2d(amplitudes)
+    n_rows, n = a.shape
+    t_start = np.broadcast_to(np.asarray(t_start, dtype=np.float64), (n_rows,))
+    
+    if NUMBA_AVAILABLE:
+        from models.sipm_jit import min_max_segments_jit
+        
+        if n <= target_points:
+            bucket, n_kept = 1, n
+        else:
+            bucket = int(np.ceil(n / (target_points // 2)))
+            n_kept = 2 * -(-n // bucket)  # Two points per (possibly partial) bucket
+        out = np.empty((n_rows, n_kept, 2))
+        return min_max_segments_jit(np.ascontiguousarray(a, dtype=np.float64),
+                                    np.ascontiguousarray(t_start), sample_time, bucket,
+                                    x_scale, y_scale, out)
+    
+    idx = downsample_indices(a, target_points)
+    t_disp = (t_start[:, np.newaxis] + idx * sample_time) * x_scale
+    a_disp = np.take_along_axis(a, idx, axis=1) * y_scale
+    return np.stack([t_disp, a_disp], axis=-1)
+
+
+def downsample_for_display(t, a, target_points: int = 2400):
+    """
+    Reduce a waveform to roughly target_points samples for display.
+    
+    Uses min/max decimation (see downsample_indices), so peaks stay visible
+    in the rendered envelope.
+    
+    Args:
+        t: Time array
+        a: Amplitude array (same length as t)
+        target_points: Maximum number of points to keep (approximately)
+        
+    Returns:
+        Tuple of (t, a) decimated arrays (the inputs if already small enough)
+    """
+    if len(a) <= target_points:
+        return t, a
+    
+    idx = downsample_indices(a, target_points)[0]
+    return t[idx], a[idx]
+
+
+def sample_for_display(items: list, limit: int, seed: int = 0) -> list:
+    """
+    Pick limit items spread over the whole list for display.
+    
+    A seeded random subset (kept in the original order) is representative of
+    the full dataset, unlike the first limit items, and the same selection is
+    shown every time the view is rebuilt.
+    
+    Args:
+        items: Items to sample from (e.g. waveform results)
+        limit: Number of items to keep
+        seed: Seed of the random generator
+        
+    Returns:
+        List with the sampled items (items itself if limit covers it)
+    """
+    if limit >= len(items):
+        return items
+    
+    return [items[i] for i in sample_indices(len(items), limit, seed)]
+
+
+def sample_indices(total: int, limit: int, seed: int = 0) -> np.ndarray:
+    """
+    Sorted indices of a seeded random subset of limit out of total items.
+    
+    Same selection as sample_for_display, for data held in arrays.
+    """
+    if limit >= total:
+        return np.arange(total)
+    
+    idx = np.random.default_rng(seed).choice(total, size=limit, replace=False)
+    idx.sort()
+    return idx
@@ -321,7 +321,8 @@ class MainWindow(ctk.CTk):
         show_charge_histogram(
             self,
             self.controller.results.accepted_results,
-            self.controller.results.baseline_high
+            self.controller.results.baseline_high,
+            amplitudes_matrix=self.controller.results.amplitudes_matrix
         )
     
     def show_advanced_analysis(self):
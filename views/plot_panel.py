@@ -2,14 +2,17 @@
 Reusable plot panel component for displaying waveforms.
 """
 import customtkinter as ctk
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 
+import config
 from config import WINDOW_TIME, SAMPLE_TIME, COLOR_ACCEPTED, COLOR_REJECTED, COLOR_AFTERPULSE, COLOR_REJECTED_AFTERPULSE
 from models.analysis_results import WaveformResult
 from utils.plotting import save_figure
 
+# Time axes (µs) keyed by waveform length; every result shares the same window
+_T_AXIS_CACHE: dict = {}
 
 class PlotPanel(ctk.CTkFrame):
     """Reusable panel for displaying waveform plots."""
@@ -62,7 +65,8 @@ class PlotPanel(ctk.CTkFrame):
         self.title_label.grid(row=1, column=0, pady=2)
         
         # Create plot area
-        self.fig = plt.Figure(figsize=(5, 4), dpi=100)
+        # Plain Figure (not pyplot) so panels are not tracked by global pyplot state
+        self.fig = Figure(figsize=(5, 4), dpi=100)
         self.ax = self.fig.add_subplot(111)
         self.fig.subplots_adjust(left=0.15, right=0.95, top=0.9, bottom=0.15)
         
@@ -110,6 +114,14 @@ class PlotPanel(ctk.CTkFrame):
         # Setup context menu
         self._setup_context_menu()
 
+    def destroy(self):
+        """Release the figure and canvas before destroying the panel."""
+        self.fig.clf()
+        self.canvas.get_tk_widget().destroy()
+        self.current_result = None
+        self.last_plot_params = None
+        super().destroy()
+
     def _setup_context_menu(self):
         """Setup right-click context menu for export."""
         import tkinter as tk
@@ -236,7 +248,11 @@ class PlotPanel(ctk.CTkFrame):
         all_peaks = result.all_peaks
         
         # Time axis (relative to center/trigger)
-        t_axis = (np.arange(len(amplitudes)) * SAMPLE_TIME - WINDOW_TIME/2) * 1e6
+        n = len(amplitudes)
+        t_axis = _T_AXIS_CACHE.get(n)
+        if t_axis is None:
+            t_axis = (np.arange(n) * SAMPLE_TIME - WINDOW_TIME/2) * 1e6
+            _T_AXIS_CACHE[n] = t_axis
         
         # Plot waveform
         self.ax.plot(t_axis, amplitudes * 1000, color=self.color, linewidth=1, label='Signal')
@@ -253,13 +269,12 @@ class PlotPanel(ctk.CTkFrame):
         # Note: Afterpulse zone visualization removed (parameter no longer used)
         
         # Plot rejected peaks (in all_peaks but not in valid_peaks)
-        # Convert to sets for proper comparison
-        valid_peaks_set = set(valid_peaks.tolist() if hasattr(valid_peaks, 'tolist') else valid_peaks)
-        all_peaks_set = set(all_peaks.tolist() if hasattr(all_peaks, 'tolist') else all_peaks)
-        rejected_peaks_indices = list(all_peaks_set - valid_peaks_set)
+        # Peak lists may be empty float arrays, so cast to index dtype before comparing
+        rejected_peaks_array = np.setdiff1d(np.asarray(all_peaks, dtype=np.intp),
+                                            np.asarray(valid_peaks, dtype=np.intp),
+                                            assume_unique=True)
         
-        if len(rejected_peaks_indices) > 0:
-            rejected_peaks_array = np.array(sorted(rejected_peaks_indices))
+        if len(rejected_peaks_array) > 0:
             self.ax.plot(t_axis[rejected_peaks_array], amplitudes[rejected_peaks_array] * 1000, 'x',
                         color='red', markeredgecolor='darkred', markersize=10, 
                         markeredgewidth=2.5, label='Rechazados', zorder=5)
@@ -270,9 +285,10 @@ class PlotPanel(ctk.CTkFrame):
                         color='white', markeredgecolor='black', markersize=6, label='Válidos', zorder=4)
         
         # Plot trigger line (dotted line at trigger voltage)
-        from config import TRIGGER_VOLTAGE
-        self.ax.axhline(y=TRIGGER_VOLTAGE * 1000, color='purple', linestyle=':', 
-                       linewidth=2, label=f'Trigger ({TRIGGER_VOLTAGE:.2f}V)', alpha=0.7)
+        # Read through the module: TRIGGER_VOLTAGE changes when a new data directory is loaded
+        trigger_voltage = config.TRIGGER_VOLTAGE
+        self.ax.axhline(y=trigger_voltage * 1000, color='purple', linestyle=':', 
+                       linewidth=2, label=f'Trigger ({trigger_voltage:.2f}V)', alpha=0.7)
         
         # Plot negative trigger line (dotted line at negative threshold)
         self.ax.axhline(y=negative_trigger_mv, color='red', linestyle=':', 
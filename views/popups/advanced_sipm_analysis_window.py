@@ -10,17 +10,159 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 from scipy.signal import find_peaks
 from datetime import datetime
+from functools import lru_cache
 import json
-import pandas as pd
 
 from config import SAMPLE_TIME, WINDOW_TIME, NUM_POINTS
 from models.pulse_analysis import (
-    calculate_rise_time, calculate_fall_time, calculate_fwhm,
+    calculate_pulse_shape_params, extract_pulse_params_batch,
     fit_exponential_recovery, extract_pulse_template, perform_pulse_pca,
     calculate_pulse_area, fit_gaussian_jitter
 )
 from utils.plotting import save_figure
-from views.popups.base_popup import BasePopup
+from views.popups.base_popup import BasePopup, debounce
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+# Quiet period before a slider drag redraws the plot
+SLIDER_DEBOUNCE_MS = 150
+
+# Resolution of the embedded canvases; save_figure exports at its own (higher) dpi
+SCREEN_DPI = 72
+
+# Above this many events the scatter plots draw a random subset (fits/stats use all)
+MAX_SCATTER_POINTS = 5000
+
+# CSV number format for exported data (float32 precision)
+CSV_FLOAT_FORMAT = '%.7g'
+
+# Rows written per batch by the pandas CSV writer (when pyarrow is not installed)
+CSV_CHUNK_ROWS = 10000
+
+# Time axis shared by every waveform of the dataset (s, relative to the trigger)
+TIME_ARRAY = np.arange(NUM_POINTS) * SAMPLE_TIME - (WINDOW_TIME / 2)
+TIME_ARRAY.setflags(write=False)  # Shared between all tabs
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def get_time_array(n_samples):
+    """Return the waveform time axis, reusing TIME_ARRAY when the length matches."""
+    if n_samples == len(TIME_ARRAY):
+        return TIME_ARRAY
+    return np.arange(n_samples) * SAMPLE_TIME - (WINDOW_TIME / 2)
+
+
+def mean_std(data):
+    """Mean and standard deviation of data, with bottleneck's C reductions when installed."""
+    if BOTTLENECK_AVAILABLE:
+        return float(bn.nanmean(data)), float(bn.nanstd(data))
+    return float(np.mean(data)), float(np.std(data))
+
+
+def scatter_subset(n_points):
+    """Indices of the points to draw in a scatter plot: all, or a random subset."""
+    if n_points <= MAX_SCATTER_POINTS:
+        return slice(None)
+    return np.sort(np.random.choice(n_points, MAX_SCATTER_POINTS, replace=False))
+
+
+def update_hist_stairs(ax, stairs, data, bins, **kwargs):
+    """
+    Bin data with np.histogram and draw it as a single filled step patch.
+    
+    The first call creates the StepPatch; later calls update it in place.
+    
+    Returns:
+        Tuple of (counts, edges, stairs)
+    """
+    counts, edges = np.histogram(data, bins=bins)
+    if stairs is None:
+        stairs = ax.stairs(counts, edges, fill=True, **kwargs)
+    else:
+        stairs.set_data(counts, edges)
+    ax.relim()
+    ax.autoscale_view()
+    return counts, edges, stairs
+
+
+def draw_if_visible(plot_state):
+    """Redraw a tab's canvas, or defer the draw until the tab is shown again."""
+    canvas = plot_state['canvas']
+    if canvas.get_tk_widget().winfo_ismapped():
+        canvas.draw_idle()
+    else:
+        plot_state['draw_pending'] = True
+
+
+def bind_deferred_draw(plot_state):
+    """Run the draw skipped by draw_if_visible once the canvas is mapped."""
+    canvas = plot_state['canvas']
+    
+    def on_map(event):
+        if plot_state.get('draw_pending'):
+            plot_state['draw_pending'] = False
+            canvas.draw_idle()
+    
+    canvas.get_tk_widget().bind("<Map>", on_map, add="+")
+
+
+@lru_cache(maxsize=None)
+def get_font(size, weight="normal"):
+    """Shared CTkFont per (size, weight); the tabs reuse them instead of building new ones."""
+    return ctk.CTkFont(size=size, weight=weight)
+
+
+def show_empty_placeholder(plot_state, plot_frame):
+    """Show the "no data" message as a label over the plot frame (no figure is built)."""
+    if plot_state.get('empty_label') is None:
+        plot_state['empty_label'] = ctk.CTkLabel(
+            plot_frame, text="No hay datos suficientes",
+            font=get_font(14), text_color="gray"
+        )
+        plot_state['empty_label'].place(relx=0.5, rely=0.5, anchor="center")
+
+
+def show_stats(plot_state, metrics_frame, stats, label_size=11, value_size=13, pady=5):
+    """
+    Show (label, value, color) rows in a tab's metrics panel.
+    
+    The row widgets are created on the first call and afterwards only
+    reconfigured; they are rebuilt only if the list of labels changes.
+    """
+    labels = [label for label, _, _ in stats]
+    
+    if plot_state.get('stat_labels') != labels:
+        if plot_state.get('stats_container') is not None:
+            plot_state['stats_container'].destroy()
+        
+        stats_container = ctk.CTkFrame(metrics_frame, fg_color="transparent")
+        stats_container.pack(fill="both", expand=True, padx=10)
+        label_font = get_font(label_size)
+        value_font = get_font(value_size, "bold")
+        
+        value_widgets = []
+        for label in labels:
+            frame = ctk.CTkFrame(stats_container, fg_color="#2b2b2b")
+            frame.pack(fill="x", pady=pady)
+            
+            lbl = ctk.CTkLabel(frame, text=label, font=label_font)
+            lbl.pack(pady=(pady, 0))
+            
+            val = ctk.CTkLabel(frame, text="", font=value_font)
+            val.pack(pady=(0, pady))
+            value_widgets.append(val)
+        
+        plot_state['stats_container'] = stats_container
+        plot_state['stat_labels'] = labels
+        plot_state['stat_widgets'] = value_widgets
+    
+    for val, (_, value, color) in zip(plot_state['stat_widgets'], stats):
+        val.configure(text=value, text_color=color if color else "white")
 
 
 def show_advanced_sipm_analysis(parent, results, waveform_data):
@@ -52,14 +194,23 @@ def show_advanced_sipm_analysis(parent, results, waveform_data):
     tab_jitter = tabview.add("Jitter Temporal")
     tab_pulse_shape = tabview.add("Pulse Shape")
     
-    # ===== TAB 1: RECOVERY TIME ANALYSIS =====
-    create_recovery_time_tab(tab_recovery, results)
+    # Tab contents are built the first time each tab is selected
+    tab_builders = {
+        # ===== TAB 1: RECOVERY TIME ANALYSIS =====
+        "Recovery Time": lambda: create_recovery_time_tab(tab_recovery, results),
+        # ===== TAB 2: JITTER TEMPORAL ANALYSIS =====
+        "Jitter Temporal": lambda: create_jitter_tab(tab_jitter, results),
+        # ===== TAB 3: PULSE SHAPE ANALYSIS =====
+        "Pulse Shape": lambda: create_pulse_shape_tab(tab_pulse_shape, results),
+    }
     
-    # ===== TAB 2: JITTER TEMPORAL ANALYSIS =====
-    create_jitter_tab(tab_jitter, results)
+    def build_selected_tab():
+        builder = tab_builders.pop(tabview.get(), None)
+        if builder is not None:
+            builder()
     
-    # ===== TAB 3: PULSE SHAPE ANALYSIS =====
-    create_pulse_shape_tab(tab_pulse_shape, results)
+    tabview.configure(command=build_selected_tab)
+    build_selected_tab()
 
 
 def create_recovery_time_tab(parent, results):
@@ -77,7 +228,7 @@ def create_recovery_time_tab(parent, results):
     controls_title = ctk.CTkLabel(
         controls_frame,
         text="⚙️ Controles",
-        font=ctk.CTkFont(size=16, weight="bold")
+        font=get_font(16, "bold")
     )
     controls_title.pack(pady=(20, 15))
     
@@ -92,137 +243,149 @@ def create_recovery_time_tab(parent, results):
     metrics_title = ctk.CTkLabel(
         metrics_frame,
         text="📊 Resultados",
-        font=ctk.CTkFont(size=16, weight="bold")
+        font=get_font(16, "bold")
     )
     metrics_title.pack(pady=(20, 15))
     
-    # Extract recovery time data
-    delta_times = []
-    afterpulse_amps = []
-    waveform_counts = []  # Track number of afterpulses per waveform
+    # Extract recovery time data (one vectorized slice per waveform) into
+    # buffers sized for every later peak; trimmed to the filled length below
+    max_afterpulses = sum(max(len(res.peaks) - 1, 0) for res in results.afterpulse_results)
+    delta_times = np.empty(max_afterpulses, dtype=np.float32)
+    afterpulse_amps = np.empty(max_afterpulses, dtype=np.float32)
+    waveform_counts = np.empty(len(results.afterpulse_results), dtype=np.int64)  # Afterpulses per waveform
+    n_afterpulses = 0
+    n_waveforms = 0
     
     for res in results.afterpulse_results:
         if len(res.peaks) < 2:
             continue
         
-        # Get peak positions and amplitudes
-        peak_positions = res.peaks
+        # Get peak positions, times and amplitudes
+        peak_positions = np.asarray(res.peaks, dtype=np.intp)
+        peak_times = peak_positions * SAMPLE_TIME - (WINDOW_TIME / 2)
         peak_amps = res.amplitudes[peak_positions]
         
-        # Main peak is typically the first or largest
-        main_peak_idx = 0
-        main_peak_pos = peak_positions[main_peak_idx]
-        
-        # Calculate time array
-        time_array = np.arange(len(res.amplitudes)) * SAMPLE_TIME - (WINDOW_TIME / 2)
-        main_peak_time = time_array[main_peak_pos]
-        
-        # Get afterpulses
-        afterpulse_count = 0
-        for i in range(1, len(peak_positions)):
-            afterpulse_pos = peak_positions[i]
-            afterpulse_time = time_array[afterpulse_pos]
-            
-            delta_t = afterpulse_time - main_peak_time
-            if delta_t > 0:  # Only positive time differences
-                delta_times.append(delta_t * 1e6)  # Convert to µs
-                afterpulse_amps.append(peak_amps[i] * 1000)  # Convert to mV
-                afterpulse_count += 1
+        # Main peak is the first one; afterpulses are the later peaks
+        delta_t = peak_times[1:] - peak_times[0]
+        positive = delta_t > 0  # Only positive time differences
+        afterpulse_count = int(np.count_nonzero(positive))
         
         if afterpulse_count > 0:
-            waveform_counts.append(afterpulse_count)
-    
-    # State for plot controls
+            end = n_afterpulses + afterpulse_count
+            delta_times[n_afterpulses:end] = delta_t[positive] * 1e6  # Convert to µs
+            afterpulse_amps[n_afterpulses:end] = peak_amps[1:][positive] * 1000  # Convert to mV
+            n_afterpulses = end
+            waveform_counts[n_waveforms] = afterpulse_count
+            n_waveforms += 1
+    
+    # State for plot controls (display data kept in float32; fits cast back to float64)
     plot_state = {
         'fig': None,
         'ax': None,
         'canvas': None,
-        'delta_times': np.array(delta_times) if delta_times else np.array([]),
-        'afterpulse_amps': np.array(afterpulse_amps) if afterpulse_amps else np.array([]),
-        'waveform_counts': waveform_counts,
+        'delta_times': delta_times[:n_afterpulses],
+        'afterpulse_amps': afterpulse_amps[:n_afterpulses],
+        'waveform_counts': waveform_counts[:n_waveforms],
         'show_log': False,
-        'bin_count': 20
+        'bin_count': 20,
+        'fit_cache': None,  # (tau, A0) of the exponential fit; the data never changes
+        'hist_stairs': None,  # StepPatch of the Δt histogram
+        'hist_bin_count': None  # Bin count the bars were built with
     }
     
+    def init_axes():
+        """Create the axes and the artists that persist across redraws."""
+        fig = plot_state['fig']
+        
+        if len(plot_state['delta_times']) == 0:
+            ax = fig.add_subplot(111)
+            ax.text(0.5, 0.5, "No hay suficientes afterpulses\npara análisis",
+                   ha='center', va='center', fontsize=14, color='gray',
+                   transform=ax.transAxes)
+            ax.set_xlabel("Δt (µs)")
+            ax.set_ylabel("Amplitud (mV)")
+            ax.set_title("Recovery Time Analysis", fontsize=13, weight='bold')
+            return
+        
+        # Create 2x1 subplot
+        ax1 = fig.add_subplot(211)
+        ax2 = fig.add_subplot(212)
+        plot_state['ax'] = (ax1, ax2)
+        
+        delta_times = plot_state['delta_times']
+        afterpulse_amps = plot_state['afterpulse_amps']
+        
+        # Top: Scatter plot with exponential fit
+        shown = scatter_subset(len(delta_times))
+        ax1.scatter(delta_times[shown], afterpulse_amps[shown], alpha=0.6, s=50, 
+                  color='#3498db', edgecolors='black', linewidth=0.5,
+                  label='Afterpulses')
+        
+        # Fit exponential if enough data (once; the data never changes)
+        if len(delta_times) > 5:
+            tau, A0, _ = fit_exponential_recovery(
+                delta_times.astype(np.float64) / 1e6,
+                afterpulse_amps.astype(np.float64) / 1000
+            )
+            plot_state['fit_cache'] = (tau, A0)
+            
+            if not np.isnan(tau):
+                tau_result = tau * 1e6  # Convert to µs
+                A0_result = A0 * 1000  # Convert to mV
+                t_fit = np.linspace(np.min(delta_times), np.max(delta_times), 200)
+                y_fit = A0_result * np.exp(-t_fit / tau_result)
+                
+                ax1.plot(t_fit, y_fit, '--', linewidth=2.5, color='#e74c3c',
+                       label=f'Fit: τ = {tau_result:.2f} µs')
+        
+        ax1.set_xlabel("Δt desde pulso principal (µs)", fontsize=10)
+        ax1.set_ylabel("Amplitud afterpulse (mV)", fontsize=10)
+        ax1.set_title("Recovery Time - Amplitud vs Δt", fontsize=11, weight='bold')
+        ax1.grid(True, alpha=0.3)
+        ax1.legend(loc='best', fontsize=9)
+        
+        # Bottom: Histogram of delta times (bars are added by update_plot)
+        ax2.set_xlabel("Δt (µs)", fontsize=10)
+        ax2.set_ylabel("Cuentas", fontsize=10)
+        ax2.set_title("Distribución de Tiempos de Afterpulse", fontsize=11, weight='bold')
+        ax2.grid(True, alpha=0.3)
+    
+    def update_histogram():
+        """Re-bin the Δt histogram if the bin count changed."""
+        if plot_state['hist_bin_count'] != plot_state['bin_count']:
+            _, _, plot_state['hist_stairs'] = update_hist_stairs(
+                plot_state['ax'][1], plot_state['hist_stairs'], plot_state['delta_times'],
+                plot_state['bin_count'],
+                alpha=0.7, facecolor='#2ecc71', edgecolor='black', linewidth=1
+            )
+            plot_state['hist_bin_count'] = plot_state['bin_count']
+    
     def update_plot():
         """Update the recovery time plot."""
         if plot_state['fig'] is None:
-            plot_state['fig'] = plt.Figure(figsize=(8, 6), dpi=100)
-        
-        plot_state['fig'].clear()
+            plot_state['fig'] = plt.Figure(figsize=(8, 6), dpi=SCREEN_DPI)
+            init_axes()
         
         if len(plot_state['delta_times']) > 0:
-            # Create 2x1 subplot
-            ax1 = plot_state['fig'].add_subplot(211)
-            ax2 = plot_state['fig'].add_subplot(212)
-            
+            ax1, ax2 = plot_state['ax']
             delta_times = plot_state['delta_times']
-            afterpulse_amps = plot_state['afterpulse_amps']
             
-            # Top: Scatter plot with exponential fit
-            ax1.scatter(delta_times, afterpulse_amps, alpha=0.6, s=50, 
-                      color='#3498db', edgecolors='black', linewidth=0.5,
-                      label='Afterpulses')
-            
-            # Fit exponential if enough data
             tau_result = np.nan
             A0_result = np.nan
-            if len(delta_times) > 5:
-                tau, A0, fitted_curve = fit_exponential_recovery(
-                    delta_times / 1e6, afterpulse_amps / 1000
-                )
-                
-                if not np.isnan(tau):
-                    tau_result = tau * 1e6  # Convert to µs
-                    A0_result = A0 * 1000  # Convert to mV
-                    t_fit = np.linspace(np.min(delta_times), np.max(delta_times), 200)
-                    y_fit = A0_result * np.exp(-t_fit / tau_result)
-                    
-                    ax1.plot(t_fit, y_fit, '--', linewidth=2.5, color='#e74c3c',
-                           label=f'Fit: τ = {tau_result:.2f} µs')
+            if plot_state['fit_cache'] is not None and not np.isnan(plot_state['fit_cache'][0]):
+                tau_result = plot_state['fit_cache'][0] * 1e6  # Convert to µs
+                A0_result = plot_state['fit_cache'][1] * 1000  # Convert to mV
             
-            if plot_state['show_log']:
-                ax1.set_yscale('log')
-            
-            ax1.set_xlabel("Δt desde pulso principal (µs)", fontsize=10)
-            ax1.set_ylabel("Amplitud afterpulse (mV)", fontsize=10)
-            ax1.set_title("Recovery Time - Amplitud vs Δt", fontsize=11, weight='bold')
-            ax1.grid(True, alpha=0.3)
-            ax1.legend(loc='best', fontsize=9)
-            
-            # Bottom: Histogram of delta times
-            ax2.hist(delta_times, bins=plot_state['bin_count'], alpha=0.7,
-                    color='#2ecc71', edgecolor='black')
-            ax2.set_xlabel("Δt (µs)", fontsize=10)
-            ax2.set_ylabel("Cuentas", fontsize=10)
-            ax2.set_title("Distribución de Tiempos de Afterpulse", fontsize=11, weight='bold')
-            ax2.grid(True, alpha=0.3)
+            ax1.set_yscale('log' if plot_state['show_log'] else 'linear')
+            update_histogram()
             
             plot_state['fig'].tight_layout()
             
-            # Update metrics - clear previous stats first
-            for widget in metrics_frame.winfo_children():
-                if widget != metrics_title:
-                    widget.destroy()
-            
-            # Now create new stats container
-            stats_container = ctk.CTkFrame(metrics_frame, fg_color="transparent")
-            stats_container.pack(fill="both", expand=True, padx=10)
+            # Update metrics (stat widgets are created once, then reconfigured)
+            stats = []
             
             def add_stat(label, value, color=None):
-                frame = ctk.CTkFrame(stats_container, fg_color="#2b2b2b")
-                frame.pack(fill="x", pady=5)
-                
-                lbl = ctk.CTkLabel(frame, text=label, font=ctk.CTkFont(size=11))
-                lbl.pack(pady=(5, 0))
-                
-                val = ctk.CTkLabel(
-                    frame,
-                    text=value,
-                    font=ctk.CTkFont(size=13, weight="bold"),
-                    text_color=color if color else "white"
-                )
-                val.pack(pady=(0, 5))
+                stats.append((label, value, color))
             
             add_stat("Waveforms c/ AP", f"{len(plot_state['waveform_counts'])}")
             add_stat("Total Afterpulses", f"{len(delta_times)}")
@@ -236,14 +399,8 @@ def create_recovery_time_tab(parent, results):
                 add_stat("A₀ (Fit)", f"{A0_result:.2f} mV", "#f39c12")
             else:
                 add_stat("τ Recovery", "N/A", "#95a5a6")
-        else:
-            ax = plot_state['fig'].add_subplot(111)
-            ax.text(0.5, 0.5, "No hay suficientes afterpulses\npara análisis",
-                   ha='center', va='center', fontsize=14, color='gray',
-                   transform=ax.transAxes)
-            ax.set_xlabel("Δt (µs)")
-            ax.set_ylabel("Amplitud (mV)")
-            ax.set_title("Recovery Time Analysis", fontsize=13, weight='bold')
+            
+            show_stats(plot_state, metrics_frame, stats)
         
         # Update canvas
         if plot_state['canvas'] is None:
@@ -262,15 +419,20 @@ def create_recovery_time_tab(parent, results):
                     context_menu.grab_release()
             
             plot_state['canvas'].get_tk_widget().bind("<Button-3>", show_context_menu)
+            bind_deferred_draw(plot_state)
         
-        plot_state['canvas'].draw()
+        draw_if_visible(plot_state)
     
     # Controls
     # Log scale toggle
     def toggle_log():
         plot_state['show_log'] = not plot_state['show_log']
         log_btn.configure(text=f"Escala: {'Log' if plot_state['show_log'] else 'Linear'}")
-        update_plot()
+        
+        # Only the y scale changes; stats, fit and histogram stay as they are
+        if plot_state['ax'] is not None and plot_state['canvas'] is not None:
+            plot_state['ax'][0].set_yscale('log' if plot_state['show_log'] else 'linear')
+            plot_state['canvas'].draw_idle()
     
     log_btn = ctk.CTkButton(
         controls_frame,
@@ -278,7 +440,7 @@ def create_recovery_time_tab(parent, results):
         command=toggle_log,
         width=140,
         height=35,
-        font=ctk.CTkFont(size=12)
+        font=get_font(12)
     )
     log_btn.pack(pady=10, padx=10)
     
@@ -286,13 +448,22 @@ def create_recovery_time_tab(parent, results):
     bin_label = ctk.CTkLabel(
         controls_frame,
         text=f"Bins histograma: {plot_state['bin_count']}",
-        font=ctk.CTkFont(size=11)
+        font=get_font(11)
     )
     bin_label.pack(pady=(10, 5))
     
+    def refresh_bins():
+        """Redraw only the histogram after a bin count change."""
+        if plot_state['ax'] is not None and plot_state['canvas'] is not None:
+            update_histogram()
+            plot_state['canvas'].draw_idle()
+    
+    debounced_refresh_bins = debounce(controls_frame, SLIDER_DEBOUNCE_MS, refresh_bins)
+    
     def on_bin_change(value):
         plot_state['bin_count'] = int(value)
         bin_label.configure(text=f"Bins histograma: {plot_state['bin_count']}")
+        debounced_refresh_bins()
     
     bin_slider = ctk.CTkSlider(
         controls_frame,
@@ -312,7 +483,7 @@ def create_recovery_time_tab(parent, results):
         command=update_plot,
         width=140,
         height=35,
-        font=ctk.CTkFont(size=12, weight="bold"),
+        font=get_font(12, "bold"),
         fg_color="#27ae60",
         hover_color="#229954"
     )
@@ -352,11 +523,12 @@ def create_recovery_time_tab(parent, results):
                 with open(filepath, 'w') as f:
                     json.dump(data, f, indent=4)
             else:
-                df = pd.DataFrame({
-                    'delta_time_us': plot_state['delta_times'],
-                    'afterpulse_amplitude_mV': plot_state['afterpulse_amps']
-                })
-                df.to_csv(filepath, index=False)
+                np.savetxt(
+                    filepath,
+                    np.column_stack([plot_state['delta_times'], plot_state['afterpulse_amps']]),
+                    fmt=CSV_FLOAT_FORMAT, delimiter=',',
+                    header='delta_time_us,afterpulse_amplitude_mV', comments=''
+                )
             
             print(f"✓ Datos exportados a {filepath}")
         except Exception as e:
@@ -368,7 +540,7 @@ def create_recovery_time_tab(parent, results):
         command=export_recovery_data,
         width=140,
         height=35,
-        font=ctk.CTkFont(size=12, weight="bold"),
+        font=get_font(12, "bold"),
         fg_color="#e67e22",
         hover_color="#d35400"
     )
@@ -378,14 +550,14 @@ def create_recovery_time_tab(parent, results):
     info_label = ctk.CTkLabel(
         controls_frame,
         text="📖 Recovery Time\n\nAnaliza el tiempo de\nrecuperación del SiPM\nmediante afterpulses.\n\nAjuste exponencial:\nA(t) = A₀·exp(-t/τ)",
-        font=ctk.CTkFont(size=10),
+        font=get_font(10),
         justify="center",
         text_color="#7f8c8d"
     )
     info_label.pack(side="bottom", pady=20, padx=10)
     
-    # Initial plot
-    update_plot()
+    # Initial plot once Tk has laid out the tab, so the window shows up first
+    parent.after_idle(update_plot)
 
 
 def create_jitter_tab(parent, results):
@@ -403,7 +575,7 @@ def create_jitter_tab(parent, results):
     controls_title = ctk.CTkLabel(
         controls_frame,
         text="⚙️ Controles",
-        font=ctk.CTkFont(size=16, weight="bold")
+        font=get_font(16, "bold")
     )
     controls_title.pack(pady=(20, 15))
     
@@ -418,122 +590,150 @@ def create_jitter_tab(parent, results):
     metrics_title = ctk.CTkLabel(
         metrics_frame,
         text="📊 Resultados",
-        font=ctk.CTkFont(size=16, weight="bold")
+        font=get_font(16, "bold")
     )
     metrics_title.pack(pady=(20, 15))
     
-    # Extract peak times and amplitudes
-    peak_times = []
-    peak_amplitudes = []
-    
-    for res in results.accepted_results:
-        if len(res.peaks) > 0:
-            time_array = np.arange(len(res.amplitudes)) * SAMPLE_TIME - (WINDOW_TIME / 2)
-            peak_time = time_array[res.peaks[0]]
-            peak_amp = res.amplitudes[res.peaks[0]]
-            
-            peak_times.append(peak_time * 1e6)  # Convert to µs
-            peak_amplitudes.append(peak_amp * 1000)  # Convert to mV
+    # Extract peak times and amplitudes of the first peak of every waveform
+    amp_matrix = results.amplitudes_matrix
+    has_peak = results.first_peak_idx >= 0
+    rows = np.flatnonzero(has_peak)
+    cols = results.first_peak_idx[has_peak]
+    
+    # Same sample -> time mapping as TIME_ARRAY, independent of waveform length
+    peak_times = ((cols * SAMPLE_TIME - (WINDOW_TIME / 2)) * 1e6).astype(np.float32)  # Convert to µs
+    
+    if amp_matrix is not None:
+        # Stacked waveforms: fancy indexing
+        peak_amplitudes = (amp_matrix[rows, cols] * 1000).astype(np.float32)  # Convert to mV
+    else:
+        # Waveforms of different lengths: one lookup per waveform, known count
+        accepted = results.accepted_results
+        peak_amplitudes = np.fromiter(
+            (accepted[row].amplitudes[col] for row, col in zip(rows, cols)),
+            dtype=np.float64, count=len(rows)
+        )
+        peak_amplitudes = (peak_amplitudes * 1000).astype(np.float32)  # Convert to mV
     
-    # State for plot controls
+    # State for plot controls (display data kept in float32; fits cast back to float64)
     plot_state = {
         'fig': None,
         'canvas': None,
-        'peak_times': np.array(peak_times) if peak_times else np.array([]),
-        'peak_amplitudes': np.array(peak_amplitudes) if peak_amplitudes else np.array([]),
+        'peak_times': peak_times,
+        'peak_amplitudes': peak_amplitudes,
         'hist_bins': 30,
-        'show_scatter': True
+        'show_scatter': True,
+        'hist_stairs': None,  # StepPatch of the peak-time histogram
+        'hist_bin_count': None  # Bin count the bars were built with
     }
     
+    # Gaussian fit (mu, sigma, fwhm), computed once; the data never changes
+    plot_state['fit'] = (fit_gaussian_jitter(plot_state['peak_times'].astype(np.float64))
+                         if len(plot_state['peak_times']) > 0 else None)
+    
+    def init_axes():
+        """Create the axes and the artists that persist across redraws."""
+        fig = plot_state['fig']
+        
+        peak_times = plot_state['peak_times']
+        
+        # Histogram on top, scatter below; the scatter axes is hidden when disabled
+        plot_state['gridspec'] = fig.add_gridspec(2, 1)
+        ax1 = fig.add_subplot(plot_state['gridspec'][0])
+        ax2 = fig.add_subplot(plot_state['gridspec'][1])
+        plot_state['ax'] = (ax1, ax2)
+        
+        # Top: Histogram (bars are added by update_plot) with Gaussian fit
+        plot_state['fit_x'] = np.linspace(np.min(peak_times), np.max(peak_times), 200)
+        mu, sigma, _ = plot_state['fit']
+        plot_state['fit_line'], = ax1.plot([], [], '--', linewidth=2.5, color='#e74c3c',
+                                           label=f'Fit Gaussiano\nμ={mu:.2f} µs\nσ={sigma:.3f} µs')
+        
+        ax1.set_xlabel("Tiempo de pico (µs)", fontsize=10)
+        ax1.set_ylabel("Cuentas", fontsize=10)
+        ax1.set_title("Distribución Temporal de Picos", fontsize=11, weight='bold')
+        ax1.grid(True, alpha=0.3)
+        
+        # Bottom: Scatter plot
+        shown = scatter_subset(len(peak_times))
+        ax2.scatter(peak_times[shown], plot_state['peak_amplitudes'][shown], alpha=0.5, s=30,
+                   color='#2ecc71', edgecolors='black', linewidth=0.5)
+        
+        ax2.set_xlabel("Tiempo de pico (µs)", fontsize=10)
+        ax2.set_ylabel("Amplitud (mV)", fontsize=10)
+        ax2.set_title("Amplitud vs Tiempo de Pico", fontsize=11, weight='bold')
+        ax2.grid(True, alpha=0.3)
+    
+    def update_histogram():
+        """Re-bin the peak-time histogram and rescale the fit curve if the bin count changed."""
+        if plot_state['hist_bin_count'] == plot_state['hist_bins']:
+            return
+        
+        ax1 = plot_state['ax'][0]
+        peak_times = plot_state['peak_times']
+        mu, sigma, _ = plot_state['fit']
+        first_draw = plot_state['hist_stairs'] is None
+        
+        _, bins, plot_state['hist_stairs'] = update_hist_stairs(
+            ax1, plot_state['hist_stairs'], peak_times, plot_state['hist_bins'],
+            alpha=0.7, facecolor='#3498db', edgecolor='black', linewidth=1,
+            label='Distribución'
+        )
+        plot_state['hist_bin_count'] = plot_state['hist_bins']
+        
+        # Gaussian pdf scaled to histogram counts (inline instead of scipy.stats.norm)
+        x = plot_state['fit_x']
+        y = (np.exp(-0.5 * ((x - mu) / sigma) ** 2) / (sigma * _SQRT_2PI)
+             * len(peak_times) * (bins[1] - bins[0]))
+        
+        fit_line = plot_state['fit_line']
+        fit_line.set_data(x, y)
+        ax1.relim()
+        ax1.autoscale_view()
+        if first_draw:
+            ax1.legend(handles=[plot_state['hist_stairs'], fit_line], loc='best', fontsize=9)
+    
     def update_plot():
         """Update jitter plots."""
+        if len(plot_state['peak_times']) == 0:
+            show_empty_placeholder(plot_state, plot_frame)
+            return
+        
         if plot_state['fig'] is None:
-            plot_state['fig'] = plt.Figure(figsize=(8, 6), dpi=100)
+            plot_state['fig'] = plt.Figure(figsize=(8, 6), dpi=SCREEN_DPI)
+            init_axes()
         
-        plot_state['fig'].clear()
+        peak_times = plot_state['peak_times']
+        ax1, ax2 = plot_state['ax']
+        gs = plot_state['gridspec']
         
-        if len(plot_state['peak_times']) > 0:
-            peak_times = plot_state['peak_times']
-            peak_amplitudes = plot_state['peak_amplitudes']
-            
-            if plot_state['show_scatter']:
-                # 2 subplots: histogram + scatter
-                ax1 = plot_state['fig'].add_subplot(211)
-                ax2 = plot_state['fig'].add_subplot(212)
-            else:
-                # Only histogram
-                ax1 = plot_state['fig'].add_subplot(111)
-            
-            # Top: Histogram with Gaussian fit
-            n, bins, patches = ax1.hist(peak_times, bins=plot_state['hist_bins'], alpha=0.7,
-                                        color='#3498db', edgecolor='black',
-                                        label='Distribución')
-            
-            # Fit Gaussian
-            mu, sigma, fwhm = fit_gaussian_jitter(peak_times)
-            
-            # Plot Gaussian fit
-            x = np.linspace(np.min(peak_times), np.max(peak_times), 200)
-            from scipy.stats import norm
-            y = norm.pdf(x, mu, sigma) * len(peak_times) * (bins[1] - bins[0])
-            
-            ax1.plot(x, y, '--', linewidth=2.5, color='#e74c3c',
-                    label=f'Fit Gaussiano\nμ={mu:.2f} µs\nσ={sigma:.3f} µs')
-            
-            ax1.set_xlabel("Tiempo de pico (µs)", fontsize=10)
-            ax1.set_ylabel("Cuentas", fontsize=10)
-            ax1.set_title("Distribución Temporal de Picos", fontsize=11, weight='bold')
-            ax1.grid(True, alpha=0.3)
-            ax1.legend(loc='best', fontsize=9)
-            
-            # Bottom: Scatter plot (if enabled)
-            if plot_state['show_scatter']:
-                ax2.scatter(peak_times, peak_amplitudes, alpha=0.5, s=30,
-                           color='#2ecc71', edgecolors='black', linewidth=0.5)
-                
-                ax2.set_xlabel("Tiempo de pico (µs)", fontsize=10)
-                ax2.set_ylabel("Amplitud (mV)", fontsize=10)
-                ax2.set_title("Amplitud vs Tiempo de Pico", fontsize=11, weight='bold')
-                ax2.grid(True, alpha=0.3)
-            
-            plot_state['fig'].tight_layout()
-            
-            # Update metrics - clear previous stats first
-            for widget in metrics_frame.winfo_children():
-                if widget != metrics_title:
-                    widget.destroy()
-            
-            # Now create new stats container
-            stats_container = ctk.CTkFrame(metrics_frame, fg_color="transparent")
-            stats_container.pack(fill="both", expand=True, padx=10)
-            
-            def add_stat(label, value, color=None):
-                frame = ctk.CTkFrame(stats_container, fg_color="#2b2b2b")
-                frame.pack(fill="x", pady=5)
-                
-                lbl = ctk.CTkLabel(frame, text=label, font=ctk.CTkFont(size=11))
-                lbl.pack(pady=(5, 0))
-                
-                val = ctk.CTkLabel(
-                    frame,
-                    text=value,
-                    font=ctk.CTkFont(size=13, weight="bold"),
-                    text_color=color if color else "white"
-                )
-                val.pack(pady=(0, 5))
-            
-            add_stat("Total Eventos", f"{len(peak_times)}")
-            add_stat("μ (Media)", f"{mu:.3f} µs", "#3498db")
-            add_stat("σ (Desv. Std)", f"{sigma:.3f} µs", "#e74c3c")
-            add_stat("FWHM", f"{fwhm:.3f} µs", "#2ecc71")
-            add_stat("RMS Jitter", f"{sigma*1000:.1f} ps", "#f39c12")
-            add_stat("Rango", f"{np.ptp(peak_times):.3f} µs", "#9b59b6")
+        if plot_state['show_scatter']:
+            # 2 subplots: histogram + scatter
+            ax1.set_subplotspec(gs[0])
         else:
-            ax = plot_state['fig'].add_subplot(111)
-            ax.text(0.5, 0.5, "No hay datos suficientes",
-                   ha='center', va='center', fontsize=14, color='gray',
-                   transform=ax.transAxes)
-            ax.set_title("Jitter Temporal Analysis", fontsize=13, weight='bold')
+            # Only histogram
+            ax1.set_subplotspec(gs[:])
+        ax2.set_visible(plot_state['show_scatter'])
+        
+        mu, sigma, fwhm = plot_state['fit']
+        update_histogram()
+        
+        plot_state['fig'].tight_layout()
+        
+        # Update metrics (stat widgets are created once, then reconfigured)
+        stats = []
+        
+        def add_stat(label, value, color=None):
+            stats.append((label, value, color))
+        
+        add_stat("Total Eventos", f"{len(peak_times)}")
+        add_stat("μ (Media)", f"{mu:.3f} µs", "#3498db")
+        add_stat("σ (Desv. Std)", f"{sigma:.3f} µs", "#e74c3c")
+        add_stat("FWHM", f"{fwhm:.3f} µs", "#2ecc71")
+        add_stat("RMS Jitter", f"{sigma*1000:.1f} ps", "#f39c12")
+        add_stat("Rango", f"{np.ptp(peak_times):.3f} µs", "#9b59b6")
+        
+        show_stats(plot_state, metrics_frame, stats)
         
         # Update canvas
         if plot_state['canvas'] is None:
@@ -551,21 +751,31 @@ def create_jitter_tab(parent, results):
                     context_menu.grab_release()
             
             plot_state['canvas'].get_tk_widget().bind("<Button-3>", show_context_menu)
+            bind_deferred_draw(plot_state)
         
-        plot_state['canvas'].draw()
+        draw_if_visible(plot_state)
     
     # Controls
     # Bins slider
     bins_label = ctk.CTkLabel(
         controls_frame,
         text=f"Bins histograma: {plot_state['hist_bins']}",
-        font=ctk.CTkFont(size=11)
+        font=get_font(11)
     )
     bins_label.pack(pady=(10, 5))
     
+    def refresh_bins():
+        """Redraw only the histograms after a bin count change."""
+        if plot_state.get('ax') is not None and plot_state['canvas'] is not None:
+            update_histogram()
+            plot_state['canvas'].draw_idle()
+    
+    debounced_refresh_bins = debounce(controls_frame, SLIDER_DEBOUNCE_MS, refresh_bins)
+    
     def on_bins_change(value):
         plot_state['hist_bins'] = int(value)
         bins_label.configure(text=f"Bins histograma: {plot_state['hist_bins']}")
+        debounced_refresh_bins()
     
     bins_slider = ctk.CTkSlider(
         controls_frame,
@@ -590,7 +800,7 @@ def create_jitter_tab(parent, results):
         command=toggle_scatter,
         width=140,
         height=35,
-        font=ctk.CTkFont(size=12)
+        font=get_font(12)
     )
     scatter_btn.pack(pady=10, padx=10)
     
@@ -601,7 +811,7 @@ def create_jitter_tab(parent, results):
         command=update_plot,
         width=140,
         height=35,
-        font=ctk.CTkFont(size=12, weight="bold"),
+        font=get_font(12, "bold"),
         fg_color="#27ae60",
         hover_color="#229954"
     )
@@ -626,7 +836,7 @@ def create_jitter_tab(parent, results):
             return
         
         try:
-            mu, sigma, fwhm = fit_gaussian_jitter(plot_state['peak_times'])
+            mu, sigma, fwhm = plot_state['fit']
             
             if filepath.endswith('.json'):
                 data = {
@@ -643,11 +853,12 @@ def create_jitter_tab(parent, results):
                 with open(filepath, 'w') as f:
                     json.dump(data, f, indent=4)
             else:
-                df = pd.DataFrame({
-                    'peak_time_us': plot_state['peak_times'],
-                    'peak_amplitude_mV': plot_state['peak_amplitudes']
-                })
-                df.to_csv(filepath, index=False)
+                np.savetxt(
+                    filepath,
+                    np.column_stack([plot_state['peak_times'], plot_state['peak_amplitudes']]),
+                    fmt=CSV_FLOAT_FORMAT, delimiter=',',
+                    header='peak_time_us,peak_amplitude_mV', comments=''
+                )
             
             print(f"✓ Datos exportados a {filepath}")
         except Exception as e:
@@ -659,7 +870,7 @@ def create_jitter_tab(parent, results):
         command=export_jitter_data,
         width=140,
         height=35,
-        font=ctk.CTkFont(size=12, weight="bold"),
+        font=get_font(12, "bold"),
         fg_color="#e67e22",
         hover_color="#d35400"
     )
@@ -669,14 +880,14 @@ def create_jitter_tab(parent, results):
     info_label = ctk.CTkLabel(
         controls_frame,
         text="📖 Jitter Temporal\n\nMide la resolución\ntemporal del detector.\n\nFWHM = 2.355·σ\n\nMenor jitter =\nmejor resolución",
-        font=ctk.CTkFont(size=10),
+        font=get_font(10),
         justify="center",
         text_color="#7f8c8d"
     )
     info_label.pack(side="bottom", pady=20, padx=10)
     
-    # Initial plot
-    update_plot()
+    # Initial plot once Tk has laid out the tab, so the window shows up first
+    parent.after_idle(update_plot)
 
 
 def create_pulse_shape_tab(parent, results):
@@ -694,7 +905,7 @@ def create_pulse_shape_tab(parent, results):
     controls_title = ctk.CTkLabel(
         controls_frame,
         text="⚙️ Controles",
-        font=ctk.CTkFont(size=16, weight="bold")
+        font=get_font(16, "bold")
     )
     controls_title.pack(pady=(20, 15))
     
@@ -709,140 +920,205 @@ def create_pulse_shape_tab(parent, results):
     metrics_title = ctk.CTkLabel(
         metrics_frame,
         text="📊 Resultados",
-        font=ctk.CTkFont(size=16, weight="bold")
+        font=get_font(16, "bold")
     )
     metrics_title.pack(pady=(20, 15))
     
     # Extract pulse shape parameters (NO AREA - removed as requested)
-    rise_times = []
-    fall_times = []
-    fwhms = []
-    rise_fall_ratios = []
-    
-    for res in results.accepted_results:
-        if len(res.peaks) > 0:
-            time_array = np.arange(len(res.amplitudes)) * SAMPLE_TIME - (WINDOW_TIME / 2)
-            peak_idx = res.peaks[0]
-            baseline = results.baseline_low
-            
-            # Calculate parameters
-            rise_time = calculate_rise_time(res.amplitudes, time_array, peak_idx, baseline)
-            fall_time = calculate_fall_time(res.amplitudes, time_array, peak_idx, baseline)
-            fwhm = calculate_fwhm(res.amplitudes, time_array, peak_idx, baseline)
-            
-            if not np.isnan(rise_time):
-                rise_times.append(rise_time * 1e9)  # Convert to ns
-            if not np.isnan(fall_time):
-                fall_times.append(fall_time * 1e9)  # Convert to ns
-            if not np.isnan(fwhm):
-                fwhms.append(fwhm * 1e9)  # Convert to ns
-            
-            # Calculate rise/fall ratio
-            if not np.isnan(rise_time) and not np.isnan(fall_time) and fall_time > 0:
-                rise_fall_ratios.append(rise_time / fall_time)
+    # One row per pulse (rise, fall, fwhm)
+    baseline = results.baseline_low
+    amp_matrix = results.amplitudes_matrix
+    
+    if amp_matrix is not None:
+        # Stacked waveforms: process every waveform with a peak in one batch
+        has_peak = results.first_peak_idx >= 0
+        shape_params = extract_pulse_params_batch(
+            amp_matrix[has_peak], results.first_peak_idx[has_peak],
+            baseline, get_time_array(amp_matrix.shape[1])
+        )
+    else:
+        pulses = [res for res in results.accepted_results if len(res.peaks) > 0]
+        shape_params = np.full((len(pulses), 3), np.nan)
+        for i, res in enumerate(pulses):
+            time_array = get_time_array(len(res.amplitudes))
+            # Calculate parameters (rise, fall and FWHM in one pass)
+            shape_params[i] = calculate_pulse_shape_params(
+                res.amplitudes, time_array, res.peaks[0], baseline
+            )
+    
+    rise_all, fall_all, fwhm_all = shape_params.T
+    # Display data only (histograms and mean/std), so float32 is enough
+    rise_times = (rise_all[~np.isnan(rise_all)] * 1e9).astype(np.float32)  # Convert to ns
+    fall_times = (fall_all[~np.isnan(fall_all)] * 1e9).astype(np.float32)  # Convert to ns
+    fwhms = (fwhm_all[~np.isnan(fwhm_all)] * 1e9).astype(np.float32)  # Convert to ns
+    
+    # Calculate rise/fall ratio
+    ratio_ok = ~np.isnan(rise_all) & ~np.isnan(fall_all) & (fall_all > 0)
+    rise_fall_ratios = (rise_all[ratio_ok] / fall_all[ratio_ok]).astype(np.float32)
     
     # State for plot controls
     plot_state = {
         'fig': None,
         'canvas': None,
-        'rise_times': np.array(rise_times) if rise_times else np.array([]),
-        'fall_times': np.array(fall_times) if fall_times else np.array([]),
-        'fwhms': np.array(fwhms) if fwhms else np.array([]),
-        'rise_fall_ratios': np.array(rise_fall_ratios) if rise_fall_ratios else np.array([]),
+        'rise_times': rise_times,
+        'fall_times': fall_times,
+        'fwhms': fwhms,
+        'rise_fall_ratios': rise_fall_ratios,
         'hist_bins': 20,
-        'show_ratio': True
+        'show_ratio': True,
+        'hist_bin_count': None,  # Bin count the histograms were built with
+        'backgrounds': None  # Axes backgrounds (without histograms) saved for blitting
+    }
+    
+    # Mean/std of each parameter; the arrays are fixed for the tab's lifetime,
+    # so they are reduced once here instead of on every redraw or export
+    plot_state['stats'] = {
+        key: mean_std(plot_state[key])
+        for key in ('rise_times', 'fall_times', 'fwhms', 'rise_fall_ratios')
+        if len(plot_state[key]) > 0
     }
     
+    # Bin counts offered by the slider
+    bins_range = (10, 40)
+    
+    # Histogram panels: (data key, color, xlabel, title)
+    hist_panels = [
+        ('rise_times', '#3498db', "Rise Time (ns)", "Rise Time (10%-90%)"),
+        ('fall_times', '#e74c3c', "Fall Time (ns)", "Fall Time (90%-10%)"),
+        ('fwhms', '#2ecc71', "FWHM (ns)", "Full Width Half Maximum"),
+        ('rise_fall_ratios', '#9b59b6', "Rise/Fall Ratio", "Ratio Rise/Fall Time"),
+    ]
+    
+    def init_axes():
+        """Create the axes that persist across redraws."""
+        fig = plot_state['fig']
+        
+        # 2x2 grid (rise, fall, fwhm, ratio) or 1x3 grid without the ratio, both
+        # laid out on one 2x6 grid so tight_layout also accepts the hidden ratio axes
+        gs = fig.add_gridspec(2, 6)
+        plot_state['layouts'] = (
+            [gs[0, 0:3], gs[0, 3:6], gs[1, 0:3], gs[1, 3:6]],
+            [gs[:, 0:2], gs[:, 2:4], gs[:, 4:6]]
+        )
+        plot_state['ax'] = []
+        for i, (key, color, xlabel, title) in enumerate(hist_panels):
+            ax = fig.add_subplot(plot_state['layouts'][0][i])
+            ax.set_xlabel(xlabel, fontsize=9)
+            ax.set_ylabel("Cuentas", fontsize=9)
+            ax.set_title(title, fontsize=10, weight='bold')
+            ax.grid(True, alpha=0.3)
+            
+            # Fixed y-range covering every bin count of the slider, so a bin
+            # change only has to redraw the histogram (blitted over the background)
+            data = plot_state[key]
+            if len(data) > 0:
+                top = max(np.histogram(data, bins=b)[0].max()
+                          for b in range(bins_range[0], bins_range[1] + 1))
+                ax.set_ylim(0, top * 1.05)
+            plot_state['ax'].append(ax)
+        plot_state['hist_stairs'] = [None] * len(hist_panels)
+    
+    def update_histogram():
+        """Re-bin the histograms if the bin count changed."""
+        if plot_state['hist_bin_count'] == plot_state['hist_bins']:
+            return
+        
+        for i, (key, color, _, _) in enumerate(hist_panels):
+            if len(plot_state[key]) == 0:
+                continue
+            _, _, plot_state['hist_stairs'][i] = update_hist_stairs(
+                plot_state['ax'][i], plot_state['hist_stairs'][i], plot_state[key],
+                plot_state['hist_bins'], alpha=0.7, facecolor=color, edgecolor='black',
+                linewidth=1, animated=True
+            )
+        plot_state['hist_bin_count'] = plot_state['hist_bins']
+    
+    def draw_histograms():
+        """Draw the (animated) histograms of the visible axes."""
+        for ax, stairs in zip(plot_state['ax'], plot_state['hist_stairs']):
+            if stairs is not None and ax.get_visible():
+                ax.draw_artist(stairs)
+    
+    def on_draw(event):
+        """After a full draw, save the axes backgrounds and paint the histograms on top."""
+        if plot_state.get('ax') is None:
+            return
+        canvas = plot_state['canvas']
+        plot_state['backgrounds'] = [
+            canvas.copy_from_bbox(ax.bbox) if ax.get_visible() else None
+            for ax in plot_state['ax']
+        ]
+        draw_histograms()
+    
+    def blit_histograms():
+        """Repaint only the histograms, falling back to a full draw."""
+        canvas = plot_state['canvas']
+        if plot_state['backgrounds'] is None or not canvas.get_tk_widget().winfo_ismapped():
+            draw_if_visible(plot_state)
+            return
+        
+        for ax, stairs, background in zip(plot_state['ax'], plot_state['hist_stairs'],
+                                          plot_state['backgrounds']):
+            if stairs is None or background is None:
+                continue
+            canvas.restore_region(background)
+            ax.draw_artist(stairs)
+            canvas.blit(ax.bbox)
+    
+    def save_png():
+        """Save the figure; animated histograms are only drawn by savefig while un-animated."""
+        stairs = [st for st in plot_state.get('hist_stairs', []) if st is not None]
+        for st in stairs:
+            st.set_animated(False)
+        try:
+            save_figure(plot_state['fig'], "pulse_shape")
+        finally:
+            for st in stairs:
+                st.set_animated(True)
+            # Backgrounds saved while printing are at the export dpi
+            plot_state['backgrounds'] = None
+            plot_state['canvas'].draw_idle()
+    
     def update_plot():
         """Update pulse shape plots."""
+        if len(plot_state['rise_times']) == 0:
+            show_empty_placeholder(plot_state, plot_frame)
+            return
+        
         if plot_state['fig'] is None:
-            plot_state['fig'] = plt.Figure(figsize=(8, 6), dpi=100)
+            plot_state['fig'] = plt.Figure(figsize=(8, 6), dpi=SCREEN_DPI)
+            init_axes()
         
-        plot_state['fig'].clear()
+        grid_2x2, grid_1x3 = plot_state['layouts']
+        ratio_ax = plot_state['ax'][3]
         
-        if len(plot_state['rise_times']) > 0:
-            if plot_state['show_ratio']:
-                # 2x2 grid: rise, fall, fwhm, ratio
-                ax1 = plot_state['fig'].add_subplot(221)
-                ax2 = plot_state['fig'].add_subplot(222)
-                ax3 = plot_state['fig'].add_subplot(223)
-                ax4 = plot_state['fig'].add_subplot(224)
-            else:
-                # 1x3 grid: rise, fall, fwhm
-                ax1 = plot_state['fig'].add_subplot(131)
-                ax2 = plot_state['fig'].add_subplot(132)
-                ax3 = plot_state['fig'].add_subplot(133)
-            
-            bins = plot_state['hist_bins']
-            
-            # Rise time histogram
-            ax1.hist(plot_state['rise_times'], bins=bins, alpha=0.7, color='#3498db', edgecolor='black')
-            ax1.set_xlabel("Rise Time (ns)", fontsize=9)
-            ax1.set_ylabel("Cuentas", fontsize=9)
-            ax1.set_title("Rise Time (10%-90%)", fontsize=10, weight='bold')
-            ax1.grid(True, alpha=0.3)
-            
-            # Fall time histogram
-            ax2.hist(plot_state['fall_times'], bins=bins, alpha=0.7, color='#e74c3c', edgecolor='black')
-            ax2.set_xlabel("Fall Time (ns)", fontsize=9)
-            ax2.set_ylabel("Cuentas", fontsize=9)
-            ax2.set_title("Fall Time (90%-10%)", fontsize=10, weight='bold')
-            ax2.grid(True, alpha=0.3)
-            
-            # FWHM histogram
-            ax3.hist(plot_state['fwhms'], bins=bins, alpha=0.7, color='#2ecc71', edgecolor='black')
-            ax3.set_xlabel("FWHM (ns)", fontsize=9)
-            ax3.set_ylabel("Cuentas", fontsize=9)
-            ax3.set_title("Full Width Half Maximum", fontsize=10, weight='bold')
-            ax3.grid(True, alpha=0.3)
-            
-            # Rise/Fall ratio (if enabled)
-            if plot_state['show_ratio'] and len(plot_state['rise_fall_ratios']) > 0:
-                ax4.hist(plot_state['rise_fall_ratios'], bins=bins, alpha=0.7, color='#9b59b6', edgecolor='black')
-                ax4.set_xlabel("Rise/Fall Ratio", fontsize=9)
-                ax4.set_ylabel("Cuentas", fontsize=9)
-                ax4.set_title("Ratio Rise/Fall Time", fontsize=10, weight='bold')
-                ax4.grid(True, alpha=0.3)
-            
-            plot_state['fig'].tight_layout()
-            
-            # Update metrics - clear previous stats first
-            for widget in metrics_frame.winfo_children():
-                if widget != metrics_title:
-                    widget.destroy()
-            
-            # Now create new stats container
-            stats_container = ctk.CTkFrame(metrics_frame, fg_color="transparent")
-            stats_container.pack(fill="both", expand=True, padx=10)
-            
-            def add_stat(label, value, color=None):
-                frame = ctk.CTkFrame(stats_container, fg_color="#2b2b2b")
-                frame.pack(fill="x", pady=4)
-                
-                lbl = ctk.CTkLabel(frame, text=label, font=ctk.CTkFont(size=10))
-                lbl.pack(pady=(4, 0))
-                
-                val = ctk.CTkLabel(
-                    frame,
-                    text=value,
-                    font=ctk.CTkFont(size=12, weight="bold"),
-                    text_color=color if color else "white"
-                )
-                val.pack(pady=(0, 4))
-            
-            add_stat("Total Pulsos", f"{len(plot_state['rise_times'])}")
-            add_stat("Rise Time", f"{np.mean(plot_state['rise_times']):.2f} ± {np.std(plot_state['rise_times']):.2f} ns", "#3498db")
-            add_stat("Fall Time", f"{np.mean(plot_state['fall_times']):.2f} ± {np.std(plot_state['fall_times']):.2f} ns", "#e74c3c")
-            add_stat("FWHM", f"{np.mean(plot_state['fwhms']):.2f} ± {np.std(plot_state['fwhms']):.2f} ns", "#2ecc71")
-            
-            if len(plot_state['rise_fall_ratios']) > 0:
-                add_stat("Ratio R/F", f"{np.mean(plot_state['rise_fall_ratios']):.3f} ± {np.std(plot_state['rise_fall_ratios']):.3f}", "#9b59b6")
-        else:
-            ax = plot_state['fig'].add_subplot(111)
-            ax.text(0.5, 0.5, "No hay datos suficientes",
-                   ha='center', va='center', fontsize=14, color='gray',
-                   transform=ax.transAxes)
-            ax.set_title("Pulse Shape Analysis", fontsize=13, weight='bold')
+        for i, ax in enumerate(plot_state['ax'][:3]):
+            ax.set_subplotspec(grid_2x2[i] if plot_state['show_ratio'] else grid_1x3[i])
+        ratio_ax.set_visible(plot_state['show_ratio'])
+        
+        update_histogram()
+        
+        plot_state['fig'].tight_layout()
+        
+        # Update metrics (stat widgets are created once, then reconfigured)
+        stats = []
+        
+        def add_stat(label, value, color=None):
+            stats.append((label, value, color))
+        
+        cached = plot_state['stats']
+        add_stat("Total Pulsos", f"{len(plot_state['rise_times'])}")
+        for key, name, color in (('rise_times', "Rise Time", "#3498db"),
+                                 ('fall_times', "Fall Time", "#e74c3c"),
+                                 ('fwhms', "FWHM", "#2ecc71")):
+            mean, std = cached.get(key, (np.nan, np.nan))
+            add_stat(name, f"{mean:.2f} ± {std:.2f} ns", color)
+        
+        if 'rise_fall_ratios' in cached:
+            mean, std = cached['rise_fall_ratios']
+            add_stat("Ratio R/F", f"{mean:.3f} ± {std:.3f}", "#9b59b6")
+        
+        show_stats(plot_state, metrics_frame, stats, label_size=10, value_size=12, pady=4)
         
         # Update canvas
         if plot_state['canvas'] is None:
@@ -850,8 +1126,7 @@ def create_pulse_shape_tab(parent, results):
             plot_state['canvas'].get_tk_widget().pack(fill="both", expand=True)
             
             context_menu = tk.Menu(parent, tearoff=0)
-            context_menu.add_command(label="💾 Guardar PNG", 
-                                    command=lambda: save_figure(plot_state['fig'], "pulse_shape"))
+            context_menu.add_command(label="💾 Guardar PNG", command=save_png)
             
             def show_context_menu(event):
                 try:
@@ -860,27 +1135,38 @@ def create_pulse_shape_tab(parent, results):
                     context_menu.grab_release()
             
             plot_state['canvas'].get_tk_widget().bind("<Button-3>", show_context_menu)
+            plot_state['canvas'].mpl_connect('draw_event', on_draw)
+            bind_deferred_draw(plot_state)
         
-        plot_state['canvas'].draw()
+        draw_if_visible(plot_state)
     
     # Controls
     # Bins slider
     bins_label = ctk.CTkLabel(
         controls_frame,
         text=f"Bins histograma: {plot_state['hist_bins']}",
-        font=ctk.CTkFont(size=11)
+        font=get_font(11)
     )
     bins_label.pack(pady=(10, 5))
     
+    def refresh_bins():
+        """Redraw only the histograms after a bin count change."""
+        if plot_state.get('ax') is not None and plot_state['canvas'] is not None:
+            update_histogram()
+            blit_histograms()
+    
+    debounced_refresh_bins = debounce(controls_frame, SLIDER_DEBOUNCE_MS, refresh_bins)
+    
     def on_bins_change(value):
         plot_state['hist_bins'] = int(value)
         bins_label.configure(text=f"Bins histograma: {plot_state['hist_bins']}")
+        debounced_refresh_bins()
     
     bins_slider = ctk.CTkSlider(
         controls_frame,
-        from_=10,
-        to=40,
-        number_of_steps=30,
+        from_=bins_range[0],
+        to=bins_range[1],
+        number_of_steps=bins_range[1] - bins_range[0],
         command=on_bins_change,
         width=140
     )
@@ -899,7 +1185,7 @@ def create_pulse_shape_tab(parent, results):
         command=toggle_ratio,
         width=140,
         height=35,
-        font=ctk.CTkFont(size=12)
+        font=get_font(12)
     )
     ratio_btn.pack(pady=10, padx=10)
     
@@ -910,7 +1196,7 @@ def create_pulse_shape_tab(parent, results):
         command=update_plot,
         width=140,
         height=35,
-        font=ctk.CTkFont(size=12, weight="bold"),
+        font=get_font(12, "bold"),
         fg_color="#27ae60",
         hover_color="#229954"
     )
@@ -926,7 +1212,8 @@ def create_pulse_shape_tab(parent, results):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filepath = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"),
+                       ("JSON files", "*.json"), ("All files", "*.*")],
             initialfile=f"pulse_shape_{timestamp}.csv",
             title="Exportar Pulse Shape Data"
         )
@@ -936,28 +1223,32 @@ def create_pulse_shape_tab(parent, results):
         
         try:
             if filepath.endswith('.json'):
+                stats = plot_state['stats']
                 data = {
                     'rise_times_ns': plot_state['rise_times'].tolist(),
                     'fall_times_ns': plot_state['fall_times'].tolist(),
                     'fwhm_ns': plot_state['fwhms'].tolist(),
                     'rise_fall_ratios': plot_state['rise_fall_ratios'].tolist() if len(plot_state['rise_fall_ratios']) > 0 else [],
                     'statistics': {
-                        'mean_rise_time': float(np.mean(plot_state['rise_times'])),
-                        'std_rise_time': float(np.std(plot_state['rise_times'])),
-                        'mean_fall_time': float(np.mean(plot_state['fall_times'])),
-                        'std_fall_time': float(np.std(plot_state['fall_times'])),
-                        'mean_fwhm': float(np.mean(plot_state['fwhms'])),
-                        'std_fwhm': float(np.std(plot_state['fwhms'])),
+                        'mean_rise_time': stats['rise_times'][0],
+                        'std_rise_time': stats['rise_times'][1],
+                        'mean_fall_time': stats.get('fall_times', (np.nan, np.nan))[0],
+                        'std_fall_time': stats.get('fall_times', (np.nan, np.nan))[1],
+                        'mean_fwhm': stats.get('fwhms', (np.nan, np.nan))[0],
+                        'std_fwhm': stats.get('fwhms', (np.nan, np.nan))[1],
                         'total_pulses': len(plot_state['rise_times'])
                     }
                 }
-                with open(filepath, 'w') as f:
-                    json.dump(data, f, indent=4)
+                try:
+                    import orjson
+                except ImportError:
+                    with open(filepath, 'w') as f:
+                        json.dump(data, f, indent=4)
+                else:
+                    with open(filepath, 'wb') as f:
+                        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             else:
                 # Create DataFrame with all available data
-                max_len = max(len(plot_state['rise_times']), len(plot_state['fall_times']), 
-                             len(plot_state['fwhms']), len(plot_state['rise_fall_ratios']))
-                
                 df_data = {}
                 if len(plot_state['rise_times']) > 0:
                     df_data['rise_time_ns'] = plot_state['rise_times']
@@ -968,8 +1259,26 @@ def create_pulse_shape_tab(parent, results):
                 if len(plot_state['rise_fall_ratios']) > 0:
                     df_data['rise_fall_ratio'] = plot_state['rise_fall_ratios']
                 
-                df = pd.DataFrame(df_data)
-                df.to_csv(filepath, index=False)
+                import pandas as pd
+                # Columns may differ in length (e.g. fewer ratios); shorter ones are padded with NaN
+                df = pd.DataFrame({name: pd.Series(values) for name, values in df_data.items()})
+                
+                if filepath.endswith('.parquet'):
+                    # Columnar, compressed binary: float32 columns are stored as is
+                    try:
+                        df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
+                    except ImportError:
+                        print("pyarrow no está instalado; no se puede exportar a Parquet")
+                        return
+                else:
+                    try:
+                        import pyarrow as pa
+                        import pyarrow.csv as pa_csv
+                    except ImportError:
+                        df.to_csv(filepath, index=False, chunksize=CSV_CHUNK_ROWS,
+                                  float_format=CSV_FLOAT_FORMAT)
+                    else:
+                        pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filepath)
             
             print(f"✓ Datos exportados a {filepath}")
         except Exception as e:
@@ -981,7 +1290,7 @@ def create_pulse_shape_tab(parent, results):
         command=export_pulse_shape_data,
         width=140,
         height=35,
-        font=ctk.CTkFont(size=12, weight="bold"),
+        font=get_font(12, "bold"),
         fg_color="#e67e22",
         hover_color="#d35400"
     )
@@ -991,11 +1300,11 @@ def create_pulse_shape_tab(parent, results):
     info_label = ctk.CTkLabel(
         controls_frame,
         text="📖 Pulse Shape\n\nCaracteriza la forma\ndel pulso SiPM.\n\nRise/Fall time:\nVelocidad de subida/bajada\n\nFWHM:\nAncho del pulso",
-        font=ctk.CTkFont(size=10),
+        font=get_font(10),
         justify="center",
         text_color="#7f8c8d"
     )
     info_label.pack(side="bottom", pady=20, padx=10)
     
-    # Initial plot
-    update_plot()
+    # Initial plot once Tk has laid out the tab, so the window shows up first
+    parent.after_idle(update_plot)
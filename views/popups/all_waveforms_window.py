@@ -3,15 +3,36 @@ All waveforms visualization window with filters and sampling.
 """
 import customtkinter as ctk
 import tkinter as tk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import numpy as np
 import threading
 import queue
 
 from config import WINDOW_TIME, SAMPLE_TIME, COLOR_WAVEFORM_OVERLAY
-from utils.plotting import save_figure
-from views.popups.base_popup import BasePopup
+from utils.plotting import save_figure, build_segments, sample_indices
+from views.popups.base_popup import BasePopup, debounce
+
+# Above this many waveforms only a random subset is drawn as lines; the rest
+# are rendered as a 2D density image behind them
+MAX_OVERLAY_LINES = 500
+
+# Above this many waveforms the overlay shows only the density image (no lines)
+DENSITY_ONLY_LIMIT = 5000
+
+# Waveforms stacked and decimated per vectorized step while building segments
+SEGMENT_CHUNK_SIZE = 256
+
+# Selections up to this many waveforms are prepared on the main thread
+SYNC_LOAD_LIMIT = SEGMENT_CHUNK_SIZE
+
+# Quiet period before filter/sampling changes rebuild the view (ms)
+VIEW_UPDATE_DEBOUNCE_MS = 150
+
+# Resolution of the embedded canvas; save_figure exports at its own (higher) dpi
+SCREEN_DPI = 72
+
+# Open windows by id(controller). Closing only hides a window, so opening it
+# again reuses its figure, canvas and toolbar instead of building new ones
+_open_windows = {}
 
 def show_all_waveforms(parent, controller):
     """
@@ -21,6 +42,20 @@ def show_all_waveforms(parent, controller):
         parent: Parent window
         controller: Analysis controller with results
     """
+    cached = _open_windows.get(id(controller))
+    if cached is not None and cached['window'].winfo_exists():
+        # Results may have changed while hidden: reload the current view
+        cached['window'].deiconify()
+        cached['window'].lift()
+        cached['window'].focus_force()
+        cached['update_view']()
+        return
+    
+    # Matplotlib is imported on first use to keep application start-up light
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+    from matplotlib.collections import LineCollection
+    
     # Create window
     window = BasePopup(parent, "Waveform Completa", 1200, 800)
     
@@ -44,22 +79,23 @@ def show_all_waveforms(parent, controller):
     show_rejected = ctk.BooleanVar(value=True)
     wf_percentage = 0.1  # Default 10%
     view_mode = 'overlay'  # 'overlay' or 'distributed'
-    canvas_refs = {'overlay': None, 'distributed': None}
+    # One figure, canvas and toolbar shared by both views; loading and
+    # status widgets placed over them are tracked in 'transient'
+    plot_state = {'fig': None, 'canvas': None, 'toolbar': None, 'transient': []}
     
-    def get_all_waveforms():
-        """Get all waveforms from compatible categories based on filters."""
-        waveforms = []
+    def get_selected_categories():
+        """Get the result categories selected by the filters."""
+        categories = []
         
         # Accepted (includes normal Accepted + Afterpulses)
         if show_accepted.get():
-            waveforms.extend(controller.results.accepted_results)
-            waveforms.extend(controller.results.afterpulse_results)
+            categories.extend(['accepted', 'afterpulse'])
             
         # Rejected
         if show_rejected.get():
-            waveforms.extend(controller.results.rejected_results)
+            categories.append('rejected')
             
-        return waveforms
+        return categories
     
     def get_plot_style(num_files):
         """Determine alpha and linewidth based on file count."""
@@ -68,16 +104,17 @@ def show_all_waveforms(parent, controller):
         elif num_files < 500: return 0.08, 1.1
         else: return 0.04, 1.0
     
+    def clear_transient(widgets=None):
+        """Destroy loading/status widgets (all of them by default)."""
+        widgets = list(plot_state['transient']) if widgets is None else widgets
+        for widget in widgets:
+            widget.destroy()
+            plot_state['transient'].remove(widget)
+    
     def update_view():
         """Update view based on current mode."""
-        nonlocal canvas_refs
-        
-        # Clear existing canvases
-        canvas_refs = {'overlay': None, 'distributed': None}
-        
-        # Clear container
-        for widget in plot_container.winfo_children():
-            widget.destroy()
+        # Remove loading/status widgets; the figure and canvas are reused
+        clear_transient()
         
         if view_mode == 'overlay':
             create_overlay_view()
@@ -96,112 +133,136 @@ def show_all_waveforms(parent, controller):
         view_mode = 'distributed'
         update_view()
     
-    def create_overlay_view():
-        """Create overlay plot (local time)."""
-        nonlocal canvas_refs
+    def load_and_plot(make_segments, populate_figure, density_only_limit=None):
+        """
+        Prepare waveform segments and plot them.
         
-        # Show loading message
-        loading_label = ctk.CTkLabel(
-            plot_container,
-            text="Cargando waveforms...",
-            font=ctk.CTkFont(size=14)
-        )
-        loading_label.place(relx=0.5, rely=0.5, anchor="center")
+        Small selections are prepared directly on the main thread. Larger ones
+        are prepared in a background thread that only does NumPy work and
+        reports progress through a queue; the figure and all Tk widgets are
+        only touched on the main thread. The figure, canvas and toolbar are
+        created once and reused by both views.
         
-        # Queue for thread communication
-        load_queue = queue.Queue()
+        Segments are built a chunk of waveforms at a time from the stacked
+        per-category amplitude arrays (AnalysisResults.stacked), into one
+        (n_waveforms, n_points, 2) array. Waveforms of different lengths fall
+        back to one call per waveform (a list).
         
-        def load_thread():
-            """Background thread to create plot."""
-            try:
-                all_results = get_all_waveforms()
-                total_available = len(all_results)
-                
-                if total_available == 0:
-                    load_queue.put(("empty", None))
-                    return
-                
-                # Apply sampling
-                limit = int(total_available * wf_percentage)
-                limit = max(1, limit) if total_available > 0 else 0
-                
-                sampled_results = all_results[:limit]
-                alpha, linewidth = get_plot_style(limit)
-                
-                # Create plot
-                fig = plt.Figure(figsize=(12, 8), dpi=100)
-                ax = fig.add_subplot(111)
-                fig.subplots_adjust(left=0.08, right=0.98, top=0.95, bottom=0.08)
-                
-                # Plot waveforms
-                for result in sampled_results:
-                    t_axis = (np.arange(len(result.amplitudes)) * SAMPLE_TIME - WINDOW_TIME/2) * 1e6
-                    ax.plot(t_axis, result.amplitudes * 1000, 
-                           color=COLOR_WAVEFORM_OVERLAY, 
-                           linewidth=linewidth, 
-                           alpha=alpha)
-                
-                ax.set_xlabel('Tiempo (µs)', fontsize=10)
-                ax.set_ylabel('Amplitud (mV)', fontsize=10)
-                ax.set_title(f'Superposición - Tiempo Local ({limit}/{total_available} waveforms)', 
-                           fontsize=12, fontweight='bold')
-                ax.grid(True, alpha=0.3)
-                
-                load_queue.put(("complete", fig))
-                
-            except Exception as e:
-                import traceback
-                error_msg = f"{str(e)}\n{traceback.format_exc()}"
-                load_queue.put(("error", error_msg))
+        Args:
+            make_segments: Function (t_half, amplitudes) -> (n, N, 2) segments, where
+                amplitudes is an (n, n_samples) array and t_half the (n,) trigger times
+            populate_figure: Function (fig, segments, limit, total_available, density)
+                drawing the view into the (cleared) shared figure
+            density_only_limit: Above this many waveforms no lines are kept and
+                populate_figure gets segments=None with the density of all of them
+        """
+        categories = get_selected_categories()
+        stacks = [controller.results.stacked(category) for category in categories]
+        offsets = np.cumsum([0] + [len(t_half) for _, t_half in stacks])
+        total_available = int(offsets[-1])
         
-        def check_queue():
-            """Check queue for results from background thread."""
-            nonlocal canvas_refs
-            
-            try:
-                msg_type, data = load_queue.get_nowait()
-                
-                if msg_type == "complete":
-                    fig = data
-                    
-                    # Remove loading label
-                    loading_label.destroy()
-                    
-                    # Create canvas
-                    canvas = FigureCanvasTkAgg(fig, master=plot_container)
-                    canvas.draw()
-                    canvas_widget = canvas.get_tk_widget()
-                    canvas_widget.pack(fill="both", expand=True)
-                    
-                    # Add toolbar
-                    toolbar_frame = tk.Frame(plot_container)
-                    toolbar_frame.pack(side="bottom", fill="x")
-                    toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
-                    toolbar.update()
-                    
-                    canvas_refs['overlay'] = canvas
-                
-                elif msg_type == "empty":
-                    loading_label.configure(
-                        text="No hay waveforms seleccionadas.\nActiva al menos un filtro (Aceptados o Rechazados)."
+        if total_available == 0:
+            if plot_state['fig'] is not None:
+                plot_state['fig'].clear()
+                plot_state['canvas'].draw_idle()
+            empty_label = ctk.CTkLabel(
+                plot_container,
+                text="No hay waveforms seleccionadas.\nActiva al menos un filtro (Aceptados o Rechazados).",
+                font=ctk.CTkFont(size=14)
+            )
+            empty_label.place(relx=0.5, rely=0.5, anchor="center")
+            plot_state['transient'].append(empty_label)
+            return
+        
+        # Apply sampling
+        limit = max(1, int(total_available * wf_percentage))
+        sampled_idx = sample_indices(total_available, limit)
+        sampled_t_half = np.concatenate([t_half for _, t_half in stacks])[sampled_idx]
+        
+        # Rows can be gathered straight from the stacked arrays when every
+        # selected category has one and they share the number of samples
+        matrices = [amplitudes for amplitudes, t_half in stacks if len(t_half) > 0]
+        stackable = (all(m is not None for m in matrices)
+                     and len({m.shape[1] for m in matrices}) == 1)
+        
+        def gather_rows(idx):
+            """Amplitude rows for sorted indices into the concatenated categories."""
+            parts = np.split(idx, np.searchsorted(idx, offsets[1:-1]))
+            return np.concatenate([
+                amplitudes[part - offset]
+                for (amplitudes, _), part, offset in zip(stacks, parts, offsets)
+                if len(part) > 0
+            ])
+        
+        def prepare_segments(report_progress):
+            """Build the segments (and the density of the lines not drawn)."""
+            if stackable:
+                # Decimate a chunk of stacked waveforms per step
+                segments = None
+                for start in range(0, limit, SEGMENT_CHUNK_SIZE):
+                    chunk_idx = sampled_idx[start:start + SEGMENT_CHUNK_SIZE]
+                    chunk_segments = make_segments(
+                        sampled_t_half[start:start + len(chunk_idx)], gather_rows(chunk_idx)
                     )
+                    if segments is None:
+                        segments = np.empty((limit,) + chunk_segments.shape[1:])
+                    segments[start:start + len(chunk_idx)] = chunk_segments
+                    report_progress((start + len(chunk_idx)) / limit)
+            else:
+                all_results = [result for category in categories
+                               for result in getattr(controller.results, f"{category}_results")]
+                segments = []
+                for i, (idx, t_half) in enumerate(zip(sampled_idx, sampled_t_half), 1):
+                    amplitudes = all_results[idx].amplitudes
+                    segments.append(make_segments(t_half[np.newaxis], amplitudes[np.newaxis])[0])
+                    if i % 50 == 0:
+                        report_progress(i / limit)
+            
+            if density_only_limit is not None and limit > density_only_limit:
+                # Individual lines are indistinguishable at this count
+                return None, compute_density(segments)
+            
+            # Bound rendering cost: random subset as lines, the rest as density
+            density = None
+            if len(segments) > MAX_OVERLAY_LINES:
+                keep = np.zeros(len(segments), dtype=bool)
+                keep[np.random.default_rng(0).choice(len(segments), MAX_OVERLAY_LINES, replace=False)] = True
+                if isinstance(segments, np.ndarray):
+                    density = compute_density(segments[~keep])
+                    segments = segments[keep]
+                else:
+                    density = compute_density([seg for seg, k in zip(segments, keep) if not k])
+                    segments = [seg for seg, k in zip(segments, keep) if k]
+            
+            return segments, density
+        
+        def show_figure(segments, density):
+            """Draw the view into the shared figure (created on first use)."""
+            if plot_state['fig'] is None:
+                fig = plt.Figure(figsize=(12, 8), dpi=SCREEN_DPI)
+                canvas = FigureCanvasTkAgg(fig, master=plot_container)
+                canvas.get_tk_widget().pack(fill="both", expand=True)
                 
-                elif msg_type == "error":
-                    loading_label.configure(text=f"Error cargando waveforms:\n{data}")
+                # Add toolbar
+                toolbar_frame = tk.Frame(plot_container)
+                toolbar_frame.pack(side="bottom", fill="x")
+                plot_state.update(fig=fig, canvas=canvas,
+                                  toolbar=NavigationToolbar2Tk(canvas, toolbar_frame))
+            else:
+                plot_state['fig'].clear()
             
-            except queue.Empty:
-                window.after(100, check_queue)
+            populate_figure(plot_state['fig'], segments, limit, total_available, density)
+            
+            # New home view for the toolbar's navigation history
+            plot_state['toolbar'].update()
+            plot_state['canvas'].draw_idle()
         
-        # Start background thread
-        thread = threading.Thread(target=load_thread, daemon=True)
-        thread.start()
-        check_queue()
-    
-    def create_distributed_view():
-        """Create distributed plot (global time)."""
-        nonlocal canvas_refs
+        if limit <= SYNC_LOAD_LIMIT:
+            # One chunk: cheaper than a thread plus queue polling
+            show_figure(*prepare_segments(lambda fraction: None))
+            return
         
-        # Show loading message
+        # Show loading message and progress
         loading_label = ctk.CTkLabel(
             plot_container,
             text="Cargando waveforms...",
@@ -209,48 +270,21 @@ def show_all_waveforms(parent, controller):
         )
         loading_label.place(relx=0.5, rely=0.5, anchor="center")
         
+        progress_bar = ctk.CTkProgressBar(plot_container, width=300)
+        progress_bar.set(0)
+        progress_bar.place(relx=0.5, rely=0.5, anchor="n", y=25)
+        plot_state['transient'].extend([loading_label, progress_bar])
+        
         # Queue for thread communication
         load_queue = queue.Queue()
         
         def load_thread():
-            """Background thread to create plot."""
+            """Background thread to prepare plot data."""
             try:
-                all_results = get_all_waveforms()
-                total_available = len(all_results)
-                
-                if total_available == 0:
-                    load_queue.put(("empty", None))
-                    return
-                
-                # Apply sampling
-                limit = int(total_available * wf_percentage)
-                limit = max(1, limit) if total_available > 0 else 0
-                
-                sampled_results = all_results[:limit]
-                alpha, linewidth = get_plot_style(limit)
-                
-                # Create plot
-                fig = plt.Figure(figsize=(14, 8), dpi=100)
-                ax = fig.add_subplot(111)
-                fig.subplots_adjust(left=0.06, right=0.98, top=0.95, bottom=0.08)
-                
-                # Plot waveforms with global time
-                for result in sampled_results:
-                    t_half = result.t_half
-                    t_start = t_half - (WINDOW_TIME / 2)
-                    t_global = t_start + (np.arange(len(result.amplitudes)) * SAMPLE_TIME)
-                    ax.plot(t_global * 1e6, result.amplitudes * 1000, 
-                           color=COLOR_WAVEFORM_OVERLAY, 
-                           linewidth=linewidth, 
-                           alpha=alpha)
-                
-                ax.set_xlabel('Tiempo Global (µs)', fontsize=10)
-                ax.set_ylabel('Amplitud (mV)', fontsize=10)
-                ax.set_title(f'Distribuido - Tiempo Global ({limit}/{total_available} waveforms)', 
-                           fontsize=12, fontweight='bold')
-                ax.grid(True, alpha=0.3)
-                
-                load_queue.put(("complete", fig))
+                segments, density = prepare_segments(
+                    lambda fraction: load_queue.put(("progress", fraction))
+                )
+                load_queue.put(("complete", (segments, density)))
                 
             except Exception as e:
                 import traceback
@@ -258,58 +292,216 @@ def show_all_waveforms(parent, controller):
                 load_queue.put(("error", error_msg))
         
         def check_queue():
-            """Check queue for results from background thread."""
-            nonlocal canvas_refs
+            """Drain the queue and update progress or show the finished plot."""
+            if not loading_label.winfo_exists():
+                return  # View was replaced while loading
             
             try:
-                msg_type, data = load_queue.get_nowait()
-                
-                if msg_type == "complete":
-                    fig = data
+                while True:
+                    msg_type, data = load_queue.get_nowait()
                     
-                    # Remove loading label
-                    loading_label.destroy()
+                    if msg_type == "progress":
+                        progress_bar.set(data)
+                        continue
                     
-                    # Create canvas
-                    canvas = FigureCanvasTkAgg(fig, master=plot_container)
-                    canvas.draw()
-                    canvas_widget = canvas.get_tk_widget()
-                    canvas_widget.pack(fill="both", expand=True)
+                    clear_transient([progress_bar])
                     
-                    # Add toolbar
-                    toolbar_frame = tk.Frame(plot_container)
-                    toolbar_frame.pack(side="bottom", fill="x")
-                    toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
-                    toolbar.update()
+                    if msg_type == "complete":
+                        clear_transient([loading_label])
+                        show_figure(*data)
                     
-                    canvas_refs['distributed'] = canvas
-                
-                elif msg_type == "empty":
-                    loading_label.configure(
-                        text="No hay waveforms seleccionadas.\nActiva al menos un filtro (Aceptados o Rechazados)."
-                    )
-                
-                elif msg_type == "error":
-                    loading_label.configure(text=f"Error cargando waveforms:\n{data}")
+                    elif msg_type == "error":
+                        loading_label.configure(text=f"Error cargando waveforms:\n{data}")
+                    return
             
             except queue.Empty:
-                window.after(100, check_queue)
+                window.after(50, check_queue)
         
         # Start background thread
         thread = threading.Thread(target=load_thread, daemon=True)
         thread.start()
         check_queue()
     
+    def compute_density(segments, bins=(1200, 600), chunk_size=200):
+        """
+        Accumulate segments into a 2D histogram (NumPy only, safe in the worker thread).
+        
+        Args:
+            segments: (n, N, 2) segment array or list of (N, 2) segments
+            
+        Returns:
+            Tuple of (H, extent) for imshow
+        """
+        if isinstance(segments, np.ndarray):
+            x_min, y_min = segments.min(axis=(0, 1))
+            x_max, y_max = segments.max(axis=(0, 1))
+        else:
+            x_min = min(seg[:, 0].min() for seg in segments)
+            x_max = max(seg[:, 0].max() for seg in segments)
+            y_min = min(seg[:, 1].min() for seg in segments)
+            y_max = max(seg[:, 1].max() for seg in segments)
+        hist_range = [[x_min, x_max], [y_min, y_max]]
+        
+        # Histogram in chunks to avoid concatenating every point at once
+        H = np.zeros(bins)
+        for start in range(0, len(segments), chunk_size):
+            points = np.concatenate(list(segments[start:start + chunk_size]))
+            H += np.histogram2d(points[:, 0], points[:, 1], bins=bins, range=hist_range)[0]
+        
+        return H, (x_min, x_max, y_min, y_max)
+    
+    def add_density_background(ax, density):
+        """Draw the density of the waveforms that are not plotted as lines."""
+        if density is None:
+            return
+        H, extent = density
+        ax.imshow(np.log1p(H.T), origin='lower', extent=extent, cmap='Greys',
+                  alpha=0.5, aspect='auto', interpolation='nearest', zorder=-2)
+    
+    def add_density_image(ax, density):
+        """Draw the density of all the waveforms as the only artist of the view."""
+        H, extent = density
+        ax.imshow(np.log1p(H.T), origin='lower', extent=extent, cmap='viridis',
+                  aspect='auto', interpolation='nearest')
+    
+    def render_lines_image(segments, alpha, linewidth, xlim, ylim, width_in, height_in,
+                           dpi=SCREEN_DPI, supersample=2):
+        """Render segments offscreen with Agg into an RGBA array covering xlim x ylim."""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        # Higher dpi keeps the image sharp when zooming before the re-render
+        fig = Figure(figsize=(width_in, height_in), dpi=dpi * supersample, facecolor='none')
+        FigureCanvasAgg(fig)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_axis_off()
+        ax.add_collection(LineCollection(segments, colors=COLOR_WAVEFORM_OVERLAY,
+                                         alpha=alpha, linewidths=linewidth, antialiased=True))
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        fig.canvas.draw()
+        return np.asarray(fig.canvas.buffer_rgba()).copy()
+    
+    def add_waveform_image(ax, segments, alpha, linewidth):
+        """
+        Show the waveforms as a pre-rendered image instead of live vector lines.
+        
+        Pan/zoom only moves the image; once the view settles the lines are
+        re-rendered for the new limits.
+        """
+        all_points = np.concatenate(segments)
+        (x_min, y_min), (x_max, y_max) = all_points.min(axis=0), all_points.max(axis=0)
+        x_margin, y_margin = ax.margins()
+        x_pad, y_pad = (x_max - x_min) * x_margin, (y_max - y_min) * y_margin
+        ax.set_xlim(x_min - x_pad, x_max + x_pad)
+        ax.set_ylim(y_min - y_pad, y_max + y_pad)
+        ax.set_autoscale_on(False)  # Image extent changes must not move the view
+        
+        def render_view():
+            xlim, ylim = ax.get_xlim(), ax.get_ylim()
+            dpi = ax.figure.dpi
+            rgba = render_lines_image(segments, alpha, linewidth, xlim, ylim,
+                                      ax.bbox.width / dpi, ax.bbox.height / dpi, dpi=dpi)
+            return rgba, (*xlim, *ylim)
+        
+        rgba, extent = render_view()
+        image = ax.imshow(rgba, extent=extent, origin='upper', aspect='auto', zorder=-1)
+        
+        pending = {'id': None}
+        
+        def refresh():
+            pending['id'] = None
+            if not window.winfo_exists() or ax not in ax.figure.axes:
+                return  # Window closed or view replaced
+            if tuple(image.get_extent()) == (*ax.get_xlim(), *ax.get_ylim()):
+                return
+            rgba, extent = render_view()
+            image.set_data(rgba)
+            image.set_extent(extent)
+            ax.figure.canvas.draw_idle()
+        
+        def on_view_changed(_ax):
+            if pending['id'] is not None:
+                window.after_cancel(pending['id'])
+            pending['id'] = window.after(200, refresh)
+        
+        ax.callbacks.connect('xlim_changed', on_view_changed)
+        ax.callbacks.connect('ylim_changed', on_view_changed)
+    
+    def add_waveform_collection(ax, segments, limit):
+        """Add all segments to the axes as a single LineCollection."""
+        alpha, linewidth = get_plot_style(limit)
+        if limit >= 200:
+            # Many lines: draw them as an image so navigation does not restroke every path
+            add_waveform_image(ax, segments, alpha, linewidth)
+            return
+        
+        # Rasterized: PDF/SVG exports embed one bitmap instead of every path
+        lc = LineCollection(segments, colors=COLOR_WAVEFORM_OVERLAY,
+                            alpha=alpha, linewidths=linewidth, antialiased=True,
+                            rasterized=True)
+        ax.add_collection(lc)
+        ax.autoscale_view()
+    
+    def create_overlay_view():
+        """Create overlay plot (local time)."""
+        def make_segments(t_half, amplitudes):
+            # Every waveform starts at -WINDOW_TIME/2 in local time
+            return build_segments(amplitudes, -WINDOW_TIME / 2, SAMPLE_TIME)
+        
+        def populate_figure(fig, segments, limit, total_available, density):
+            ax = fig.add_subplot(111)
+            fig.subplots_adjust(left=0.08, right=0.98, top=0.95, bottom=0.08)
+            
+            if segments is None:
+                add_density_image(ax, density)
+            else:
+                add_density_background(ax, density)
+                # Plot waveforms as a single collection (one artist instead of one per file)
+                add_waveform_collection(ax, segments, len(segments))
+            
+            ax.set_xlabel('Tiempo (µs)', fontsize=10)
+            ax.set_ylabel('Amplitud (mV)', fontsize=10)
+            ax.set_title(f'Superposición - Tiempo Local ({limit}/{total_available} waveforms)', 
+                       fontsize=12, fontweight='bold')
+            ax.grid(True, alpha=0.3)
+        
+        load_and_plot(make_segments, populate_figure, density_only_limit=DENSITY_ONLY_LIMIT)
+    
+    def create_distributed_view():
+        """Create distributed plot (global time)."""
+        def make_segments(t_half, amplitudes):
+            return build_segments(amplitudes, t_half - (WINDOW_TIME / 2), SAMPLE_TIME)
+        
+        def populate_figure(fig, segments, limit, total_available, density):
+            ax = fig.add_subplot(111)
+            fig.subplots_adjust(left=0.06, right=0.98, top=0.95, bottom=0.08)
+            
+            add_density_background(ax, density)
+            # Plot waveforms with global time as a single collection
+            add_waveform_collection(ax, segments, len(segments))
+            
+            ax.set_xlabel('Tiempo Global (µs)', fontsize=10)
+            ax.set_ylabel('Amplitud (mV)', fontsize=10)
+            ax.set_title(f'Distribuido - Tiempo Global ({limit}/{total_available} waveforms)', 
+                       fontsize=12, fontweight='bold')
+            ax.grid(True, alpha=0.3)
+        
+        load_and_plot(make_segments, populate_figure)
+    
+    # Rapid filter/sampling changes collapse into a single reload
+    schedule_update_view = debounce(window, VIEW_UPDATE_DEBOUNCE_MS, update_view)
+    
     def on_filter_change():
         """Handle filter checkbox changes."""
-        update_view()
+        schedule_update_view()
     
     def on_percentage_change(value):
         """Handle percentage dropdown change."""
         nonlocal wf_percentage
         # Remove '%' symbol and convert to decimal
         wf_percentage = float(value.rstrip('%')) / 100.0
-        update_view()
+        schedule_update_view()
     
     # Build controls
     # Left: View mode toggle
@@ -347,5 +539,9 @@ def show_all_waveforms(parent, controller):
     percentage_dropdown.set("10%")  # Default
     percentage_dropdown.pack(side="left", padx=5)
     
+    # Hide instead of destroying so the next open can reuse this window
+    window.protocol("WM_DELETE_WINDOW", window.withdraw)
+    _open_windows[id(controller)] = {'window': window, 'update_view': update_view}
+    
     # Initial plot (overlay mode)
     create_overlay_view()
@@ -13,6 +13,34 @@ def show_error_dialog(message: str):
     """
     messagebox.showerror("Error", message)
 
+def debounce(widget, delay_ms: int, fn):
+    """
+    Wrap fn so it only runs once calls have stopped for delay_ms.
+    
+    Each call cancels the pending one and reschedules fn with widget.after,
+    so a slider drag triggers a single run after the motion stops.
+    
+    Args:
+        widget: Tk widget used to schedule the call
+        delay_ms: Quiet period in milliseconds
+        fn: Callback to run with the arguments of the last call
+        
+    Returns:
+        Debounced callable
+    """
+    pending = {'id': None}
+    
+    def run(*args, **kwargs):
+        pending['id'] = None
+        fn(*args, **kwargs)
+    
+    def wrapper(*args, **kwargs):
+        if pending['id'] is not None:
+            widget.after_cancel(pending['id'])
+        pending['id'] = widget.after(delay_ms, lambda: run(*args, **kwargs))
+    
+    return wrapper
+
 class BasePopup(ctk.CTkToplevel):
     """Base class for popup windows."""
     
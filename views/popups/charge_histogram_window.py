@@ -9,11 +9,76 @@ import numpy as np
 from scipy.stats import norm
 
 from config import SAMPLE_TIME
+from models.sipm_jit import integrate_above
 from utils import ResultsExporter
 from utils.plotting import save_figure
 from views.popups.base_popup import BasePopup
 
-def show_charge_histogram(parent, accepted_results, baseline_high):
+try:
+    from fast_histogram import histogram1d
+    FAST_HISTOGRAM_AVAILABLE = True
+except ImportError:
+    FAST_HISTOGRAM_AVAILABLE = False
+
+# Number of equal-width bins of the charge histogram
+CHARGE_HIST_BINS = 50
+
+# Colors of the fitted peaks (first peak + up to 3 additional Gaussians)
+FIT_COLORS = ['#e74c3c', '#2ecc71', '#f39c12', '#9b59b6']
+
+
+def charge_histogram(charges, bins, hist_range):
+    """
+    Count charges in equal-width bins, with fast-histogram when installed.
+    
+    Args:
+        charges: 1D array of charges
+        bins: Number of bins
+        hist_range: (low, high) edges; high is included in the last bin, as in np.histogram
+        
+    Returns:
+        Tuple of (counts, edges)
+    """
+    lo, hi = hist_range
+    if lo == hi:
+        # Same widening np.histogram applies to a degenerate range
+        lo, hi = lo - 0.5, hi + 0.5
+    
+    if FAST_HISTOGRAM_AVAILABLE:
+        counts = histogram1d(charges, bins=bins, range=(lo, hi))
+        # fast-histogram bins are half-open: add the values sitting on the upper edge
+        counts[-1] += np.count_nonzero(charges == hi)
+    else:
+        counts, _ = np.histogram(charges, bins=bins, range=(lo, hi))
+    return counts, np.linspace(lo, hi, bins + 1)
+
+
+def nearest_bin(bin_centers, value):
+    """
+    Index of the bin center closest to value, by binary search.
+    
+    bin_centers must be sorted ascending. Ties go to the lower index, like
+    np.argmin(np.abs(bin_centers - value)).
+    """
+    idx = int(np.searchsorted(bin_centers, value))
+    if idx == len(bin_centers) or (idx > 0 and value - bin_centers[idx - 1] <= bin_centers[idx] - value):
+        idx -= 1
+    return idx
+
+
+def gaussian(x, amp, mu, sigma):
+    """Gaussian peak fitted to each photo-electron peak of the charge histogram."""
+    return amp * np.exp(-(x - mu)**2 / (2 * sigma**2))
+
+
+def gaussian_jac(x, amp, mu, sigma):
+    """Analytic Jacobian of amp * exp(-(x - mu)**2 / (2 * sigma**2)) w.r.t. (amp, mu, sigma)."""
+    dx = x - mu
+    e = np.exp(-dx**2 / (2 * sigma**2))
+    return np.column_stack([e, amp * e * dx / sigma**2, amp * e * dx**2 / sigma**3])
+
+
+def show_charge_histogram(parent, accepted_results, baseline_high, amplitudes_matrix=None):
     """
     Show charge histogram of accepted peaks with multi-Gaussian fitting.
     
@@ -21,6 +86,9 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
         parent: Parent window
         accepted_results: List of accepted results
         baseline_high: Threshold for integral calculation
+        amplitudes_matrix: Optional stacked (n_accepted, n_samples) amplitudes of the
+            accepted results (AnalysisResults.amplitudes_matrix); used directly as
+            the charge integration buffer instead of concatenating the waveforms
     """
     if not accepted_results:
         return
@@ -48,33 +116,52 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
     metrics_frame = ctk.CTkFrame(main_frame)
     metrics_frame.grid(row=0, column=2, sticky="nsew", padx=(5, 0))
     
-    # Calculate charges
-    charges = []
-    
-    for res in accepted_results:
-        # Calculate integral above baseline
-        signal_above_baseline = res.amplitudes[res.amplitudes > baseline_high] - baseline_high
-        
-        if len(signal_above_baseline) > 0:
-            charge = np.sum(signal_above_baseline) * SAMPLE_TIME
-            charges.append(charge)
-            
-    if not charges:
+    # Calculate charges: integral above baseline of every waveform in one pass
+    # over the flat amplitudes (compiled kernel, NumPy reduceat fallback)
+    if amplitudes_matrix is not None and len(amplitudes_matrix) == len(accepted_results):
+        # Stacked waveforms: the contiguous matrix already is the flat buffer
+        n_rows, n_samples = amplitudes_matrix.shape
+        flat = amplitudes_matrix.ravel()
+        offsets = np.arange(0, n_rows * n_samples + 1, n_samples, dtype=np.int64)
+    else:
+        offsets = np.zeros(len(accepted_results) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(res.amplitudes) for res in accepted_results])
+        flat = np.concatenate([res.amplitudes for res in accepted_results])
+    charges = integrate_above(flat, offsets, baseline_high) * SAMPLE_TIME
+    
+    # Waveforms that never cross the baseline have no charge
+    charges = charges[charges > 0]
+    
+    if len(charges) == 0:
         print("No hay carga calculable.")
         window.destroy()
         return
-        
-    charges = np.array(charges)
+    
     # Convert to nV*s for display (typical SiPM units)
     charges_plot = charges * 1e9  # V*s -> nV*s
     
-    # Store plot elements
+    # Global statistics (also exported); the charges never change, so they are computed once
+    charge_stats = {
+        'mean': float(np.mean(charges_plot)),
+        'std': float(np.std(charges_plot)),
+        'min': float(np.min(charges_plot)),
+        'max': float(np.max(charges_plot)),
+        'count': len(charges_plot)
+    }
+    
+    # Store plot elements; the charges never change, so the histogram range is fixed
     plot_state = {
         'fig': None,
         'ax': None,
         'canvas': None,
         'n': None,
-        'bins': None
+        'bins': None,
+        'bin_centers': None,
+        'peaks_idx': None,  # Local maxima of the histogram
+        'sorted_by_position': None,  # (position, index) of those maxima, left to right
+        'hist_range': (charge_stats['min'], charge_stats['max']),
+        'fit_x': None,  # Abscissa of the fit curves (histogram x-range)
+        'fit_lines': []  # One dashed curve per peak, reused across updates
     }
     
     # Controls Panel
@@ -97,7 +184,7 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
     peak_label.pack(pady=(5, 5))
     
     # Calculate initial guess as the mean
-    initial_peak = np.mean(charges_plot)
+    initial_peak = charge_stats['mean']
     
     peak_entry = ctk.CTkEntry(
         peak_frame,
@@ -142,43 +229,69 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
     gaussians_slider.set(0)
     gaussians_slider.pack(pady=(0, 5))
     
+    def init_plot():
+        """Create the figure and the histogram; the charges never change, so this runs once."""
+        plot_state['fig'] = plt.Figure(figsize=(8, 6), dpi=100)
+        ax = plot_state['ax'] = plot_state['fig'].add_subplot(111)
+        
+        # Histogram (use linear scale for better visualization of fits)
+        n, bins = charge_histogram(charges_plot, CHARGE_HIST_BINS, plot_state['hist_range'])
+        ax.stairs(n, bins, fill=True, alpha=0.7, facecolor='#3498db',
+                  edgecolor='black', linewidth=1, label='Data')
+        plot_state['n'] = n
+        plot_state['bins'] = bins
+        plot_state['bin_centers'] = (bins[:-1] + bins[1:]) / 2
+        
+        # Find local maxima in the histogram (more sensitive)
+        # Use a lower threshold to find more peaks
+        from scipy.signal import find_peaks
+        peaks_idx, _ = find_peaks(n, height=np.max(n) * 0.02, distance=2, prominence=np.max(n) * 0.01)
+        plot_state['peaks_idx'] = peaks_idx
+        # Sort peaks by their position (left to right)
+        plot_state['sorted_by_position'] = sorted(zip(plot_state['bin_centers'][peaks_idx], peaks_idx))
+        
+        # Fit curves span the histogram's x-range
+        xmin, xmax = ax.get_xlim()
+        plot_state['fit_x'] = np.linspace(xmin, xmax, 500)
+        
+        # Hidden until a fit fills them; '_' labels keep them out of the legend
+        plot_state['fit_lines'] = [
+            ax.plot([], [], '--', linewidth=2.5, color=color, label='_fit', visible=False)[0]
+            for color in FIT_COLORS
+        ]
+        
+        ax.set_xlabel(r"Carga (nV$\cdot$s)", fontsize=10)
+        ax.set_ylabel("Cuentas", fontsize=10)
+        ax.set_title("Histograma de Carga (Integral sobre Baseline)", fontsize=12, weight='bold')
+        ax.grid(True, which="both", ls="-", alpha=0.2)
+    
     # Update button
     def update_plot():
-        """Update the plot with new fitting parameters."""
+        """Update the Gaussian fits with new fitting parameters."""
         try:
             first_peak = float(peak_entry.get())
             num_additional = int(gaussians_slider.get())
             
-            # Clear previous plot
-            if plot_state['ax'] is not None:
-                plot_state['ax'].clear()
-            else:
-                plot_state['fig'] = plt.Figure(figsize=(8, 6), dpi=100)
-                plot_state['ax'] = plot_state['fig'].add_subplot(111)
+            if plot_state['ax'] is None:
+                init_plot()
             
             ax = plot_state['ax']
+            n = plot_state['n']
+            bin_centers = plot_state['bin_centers']
             
-            # Histogram (use linear scale for better visualization of fits)
-            n, bins, patches = ax.hist(charges_plot, bins=50, alpha=0.7, 
-                                      color='#3498db', edgecolor='black', 
-                                      label='Data')
-            plot_state['n'] = n
-            plot_state['bins'] = bins
+            # Only the fits change between updates: hide the previous curves
+            for line in plot_state['fit_lines']:
+                line.set_visible(False)
+                line.set_label('_fit')
             
-            # Find peaks and fit Gaussians
-            from scipy.signal import find_peaks
+            # Select peaks (histogram maxima found once in init_plot) and fit Gaussians
             from scipy.optimize import curve_fit
             
-            # Get bin centers
-            bin_centers = (bins[:-1] + bins[1:]) / 2
-            
-            # Find local maxima in the histogram (more sensitive)
-            # Use a lower threshold to find more peaks
-            peaks_idx, properties = find_peaks(n, height=np.max(n) * 0.02, distance=2, prominence=np.max(n) * 0.01)
+            peaks_idx = plot_state['peaks_idx']
             
             if len(peaks_idx) == 0:
                 # No peaks found, use the specified value
-                idx_first = np.argmin(np.abs(bin_centers - first_peak))
+                idx_first = nearest_bin(bin_centers, first_peak)
                 selected_peaks = [idx_first]
                 
                 # If additional peaks requested, create them at expected positions
@@ -186,20 +299,18 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
                     # Assume peaks are evenly spaced (typical for SiPM multi-photon peaks)
                     for i in range(1, num_additional + 1):
                         expected_position = first_peak * (i + 1)  # 2x, 3x, 4x the first peak
-                        idx_expected = np.argmin(np.abs(bin_centers - expected_position))
+                        idx_expected = nearest_bin(bin_centers, expected_position)
                         if idx_expected < len(bin_centers):
                             selected_peaks.append(idx_expected)
             else:
                 # Find the first peak near the specified value
-                distances = np.abs(bin_centers[peaks_idx] - first_peak)
-                first_peak_idx = peaks_idx[np.argmin(distances)]
+                first_peak_idx = peaks_idx[nearest_bin(bin_centers[peaks_idx], first_peak)]
                 
                 # Get the position of this peak in the bin_centers array
                 first_peak_position = bin_centers[first_peak_idx]
                 
                 # Now find additional peaks AFTER this first peak
-                # Sort peaks by their position (left to right)
-                sorted_by_position = sorted(zip(bin_centers[peaks_idx], peaks_idx))
+                sorted_by_position = plot_state['sorted_by_position']
                 
                 # Select the first peak and then the next ones after it
                 selected_peaks = [first_peak_idx]
@@ -217,14 +328,13 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
                     if num_detected < num_additional:
                         for i in range(num_detected + 1, num_additional + 1):
                             expected_position = first_peak_position * (i + 1)
-                            idx_expected = np.argmin(np.abs(bin_centers - expected_position))
+                            idx_expected = nearest_bin(bin_centers, expected_position)
                             if idx_expected < len(bin_centers) and idx_expected not in selected_peaks:
                                 selected_peaks.append(idx_expected)
             
             # Fit each Gaussian
-            colors = ['#e74c3c', '#2ecc71', '#f39c12', '#9b59b6']
-            xmin, xmax = ax.get_xlim()
-            x = np.linspace(xmin, xmax, 500)
+            x = plot_state['fit_x']
+            xmin, xmax = x[0], x[-1]
             
             fit_results = []
             
@@ -239,24 +349,24 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
                     next_peak_pos = bin_centers[selected_peaks[i+1]]
                     std_init = abs(next_peak_pos - mu_init) / 3
                 else:
-                    std_init = np.std(charges_plot) / (len(selected_peaks) + 1)
-                
-                # Define Gaussian function
-                def gaussian(x, amp, mu, sigma):
-                    return amp * np.exp(-(x - mu)**2 / (2 * sigma**2))
+                    std_init = charge_stats['std'] / (len(selected_peaks) + 1)
                 
                 # Fit around this peak
                 try:
                     # Define fitting window
                     window = max(3 * std_init, (xmax - xmin) / 20)  # At least 5% of the range
-                    mask = (bin_centers >= mu_init - window) & (bin_centers <= mu_init + window)
+                    # Bin centers are sorted: the window is a contiguous slice
+                    i0 = np.searchsorted(bin_centers, mu_init - window, side='left')
+                    i1 = np.searchsorted(bin_centers, mu_init + window, side='right')
                     
-                    if np.sum(mask) > 3:  # Need at least 3 points
+                    if i1 - i0 > 3:  # Need at least 3 points
                         popt, pcov = curve_fit(
                             gaussian,
-                            bin_centers[mask],
-                            n[mask],
+                            bin_centers[i0:i1],
+                            n[i0:i1],
                             p0=[amp_init, mu_init, std_init],
+                            jac=gaussian_jac,
+                            check_finite=False,  # Histogram counts are always finite
                             maxfev=10000,
                             bounds=([0, mu_init - window, std_init/10], 
                                    [amp_init * 2, mu_init + window, window])
@@ -266,18 +376,18 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
                         
                         # Plot the fit
                         y_fit = gaussian(x, amp, mu, sigma)
-                        ax.plot(x, y_fit, '--', linewidth=2.5, 
-                               color=colors[i % len(colors)],
-                               label=f'Pico {i+1}: μ={mu:.1f}, σ={sigma:.1f}')
+                        line = plot_state['fit_lines'][i % len(FIT_COLORS)]
+                        line.set_data(x, y_fit)
+                        line.set_label(f'Pico {i+1}: μ={mu:.1f}, σ={sigma:.1f}')
+                        line.set_visible(True)
                         
                         fit_results.append({'peak': i+1, 'mu': mu, 'sigma': sigma, 'amp': amp})
                 except Exception as e:
                     pass  # Silently skip failed fits
             
-            ax.set_xlabel(r"Carga (nV$\cdot$s)", fontsize=10)
-            ax.set_ylabel("Cuentas", fontsize=10)
-            ax.set_title("Histograma de Carga (Integral sobre Baseline)", fontsize=12, weight='bold')
-            ax.grid(True, which="both", ls="-", alpha=0.2)
+            # Limits from the histogram and the current fits only
+            ax.relim(visible_only=True)
+            ax.autoscale_view()
             ax.legend(loc='best', fontsize=8)
             
             # Update canvas
@@ -287,7 +397,7 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
                 # Attach context menu
                 plot_state['canvas'].get_tk_widget().bind("<Button-3>", show_context_menu)
             
-            plot_state['canvas'].draw()
+            plot_state['canvas'].draw_idle()
             
             # Update metrics
             update_metrics(fit_results)
@@ -369,9 +479,9 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
             )
             val.pack(pady=(0, 5))
         
-        add_stat("Total Eventos", f"{len(charges_plot):,}")
-        add_stat("Media Global", f"{np.mean(charges_plot):.2f} nV·s", "#3498db")
-        add_stat("Desv. Std Global", f"{np.std(charges_plot):.2f} nV·s", "#e74c3c")
+        add_stat("Total Eventos", f"{charge_stats['count']:,}")
+        add_stat("Media Global", f"{charge_stats['mean']:.2f} nV·s", "#3498db")
+        add_stat("Desv. Std Global", f"{charge_stats['std']:.2f} nV·s", "#e74c3c")
         
         # Fit results
         if fit_results:
@@ -385,12 +495,11 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
             )
             fits_label.pack(pady=(5, 10))
             
-            colors = ['#e74c3c', '#2ecc71', '#f39c12', '#9b59b6']
             for result in fit_results:
                 add_stat(
                     f"Pico {result['peak']}",
                     f"μ={result['mu']:.1f}\nσ={result['sigma']:.1f}",
-                    colors[(result['peak']-1) % len(colors)]
+                    FIT_COLORS[(result['peak']-1) % len(FIT_COLORS)]
                 )
     
     # Initial plot
@@ -494,18 +603,19 @@ def show_charge_histogram(parent, accepted_results, baseline_high):
                 df = pd.DataFrame({'charge_mV_ns': charges_plot})
                 df.to_csv(filepath, index=False)
             else:
-                data = {
-                    'charge_mV_ns': charges_plot.tolist(),
-                    'stats': {
-                        'mean': float(np.mean(charges_plot)),
-                        'std': float(np.std(charges_plot)),
-                        'min': float(np.min(charges_plot)),
-                        'max': float(np.max(charges_plot)),
-                        'count': len(charges_plot)
-                    }
-                }
-                with open(filepath, 'w') as f:
-                    json.dump(data, f, indent=4)
+                try:
+                    import orjson
+                except ImportError:
+                    data = {'charge_mV_ns': charges_plot.tolist(), 'stats': charge_stats}
+                    with open(filepath, 'w') as f:
+                        json.dump(data, f, indent=4)
+                else:
+                    # orjson writes the array natively, without a list of Python floats
+                    data = {'charge_mV_ns': charges_plot, 'stats': charge_stats}
+                    with open(filepath, 'wb') as f:
+                        f.write(orjson.dumps(
+                            data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+                        ))
             print(f"[OK] Datos exportados a {filepath}")
         except Exception as e:
             print(f"Error exportando: {e}")
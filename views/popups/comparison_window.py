@@ -339,8 +339,8 @@ class ComparisonWindow(ctk.CTkToplevel):
                 self.ax2.set_ylabel("Amplitud (mV)", fontsize=9)
                 self.ax2.grid(True, alpha=0.3)
         
-        self.canvas1.draw()
-        self.canvas2.draw()
+        self.canvas1.draw_idle()
+        self.canvas2.draw_idle()
         
         # Update info
         if results1:
@@ -238,20 +238,37 @@ def show_signal_processing(parent, waveform_data, current_results):
     rms_after_label.pack(pady=(1, 8))
     
     # ===== PLOT FUNCTIONS =====
-    def apply_current_filter(amplitudes):
-        """Apply the currently selected filter."""
+    def get_filter_params():
+        """Read the selected filter and its parameters from the widgets (Tk thread only)."""
+        filter_name = state['current_filter']
+        if filter_name == "Smoothing":
+            return filter_name, {'window': int(param_widgets['window_slider'].get()),
+                                 'poly': int(param_widgets['poly_slider'].get())}
+        elif filter_name == "Decimation":
+            return filter_name, {'factor': int(param_widgets['factor_slider'].get())}
+        return filter_name, {}
+    
+    def apply_current_filter(amplitudes, filter_params=None):
+        """
+        Apply the currently selected filter.
+        
+        Args:
+            amplitudes: Waveform amplitudes
+            filter_params: Optional (filter_name, params) snapshot from get_filter_params();
+                required when called outside the Tk thread
+        """
+        filter_name = state['current_filter']
         try:
-            filter_name = state['current_filter']
+            if filter_params is None:
+                filter_params = get_filter_params()
+            filter_name, params = filter_params
             if filter_name == "Smoothing":
-                window = int(param_widgets['window_slider'].get())
-                poly = int(param_widgets['poly_slider'].get())
-                return apply_savitzky_golay(amplitudes, window, poly)
+                return apply_savitzky_golay(amplitudes, params['window'], params['poly'])
                 
             elif filter_name == "Decimation":
                 from scipy.signal import decimate
-                factor = int(param_widgets['factor_slider'].get())
                 # Decimate without interpolating back - this reduces file size
-                filtered = decimate(amplitudes, factor, zero_phase=True)
+                filtered = decimate(amplitudes, params['factor'], zero_phase=True)
                 return filtered
         except Exception as e:
             print(f"Error applying filter {filter_name}: {e}")
@@ -345,9 +362,7 @@ def show_signal_processing(parent, waveform_data, current_results):
             state['canvas'] = FigureCanvasTkAgg(state['fig'], master=plot_frame)
             state['canvas'].get_tk_widget().pack(fill="both", expand=True)
         
-        state['canvas'].draw()
-        state['canvas'].get_tk_widget().update_idletasks()
-        state['canvas'].flush_events()
+        state['canvas'].draw_idle()
         
     
     # Update button
@@ -460,51 +475,66 @@ def show_signal_processing(parent, waveform_data, current_results):
         success_count = 0
         error_count = 0
         
-        for i, wf_path in enumerate(waveform_data.waveform_files):
+        # Widgets must not be touched from worker threads: snapshot the filter once
+        filter_params = get_filter_params()
+        
+        def process_waveform(i, wf_path):
+            """Read, filter and write one waveform (runs in a worker thread)."""
+            # Read original waveform
+            t_half, amplitudes = read_waveform_file(wf_path)
+            
+            # Apply filter
+            filtered_amps = apply_current_filter(amplitudes, filter_params)
+            
+            # Save to new file
+            # Extract index from original filename (assuming format Name_Index.txt)
             try:
-                # Read original waveform
-                t_half, amplitudes = read_waveform_file(wf_path)
-                
-                # Apply filter
-                filtered_amps = apply_current_filter(amplitudes)
-                
-                # Save to new file
-                # Extract index from original filename (assuming format Name_Index.txt)
-                try:
-                    # Get the last part after splitting by '_'
-                    original_stem = wf_path.stem
-                    # Find the last underscore to isolate the index
-                    last_underscore_idx = original_stem.rfind('_')
-                    if last_underscore_idx != -1:
-                        suffix = original_stem[last_underscore_idx:] # e.g., "_0"
-                    else:
-                        # Fallback if no underscore found
-                        suffix = f"_{i}"
-                except:
+                # Get the last part after splitting by '_'
+                original_stem = wf_path.stem
+                # Find the last underscore to isolate the index
+                last_underscore_idx = original_stem.rfind('_')
+                if last_underscore_idx != -1:
+                    suffix = original_stem[last_underscore_idx:] # e.g., "_0"
+                else:
+                    # Fallback if no underscore found
                     suffix = f"_{i}"
+            except:
+                suffix = f"_{i}"
 
-                # New filename: DirectoryName + Suffix + Extension
-                new_filename = f"{new_dir_name}{suffix}{wf_path.suffix}"
-                new_file_path = new_dir / new_filename
-                
-                # Write filtered data in same format as original
-                with open(new_file_path, 'w') as f:
-                    # Write header (t_half)
-                    f.write(f"{t_half}\n")
-                    f.write("\n") # Restore blank line required by format
-                    # Write filtered amplitudes
-                    for amp in filtered_amps:
-                        f.write(f"{amp}\n")
-                
-                success_count += 1
+            # New filename: DirectoryName + Suffix + Extension
+            new_filename = f"{new_dir_name}{suffix}{wf_path.suffix}"
+            new_file_path = new_dir / new_filename
+            
+            # Write filtered data in same format as original
+            lines = [f"{t_half}\n", "\n"]  # Header (t_half) + blank line required by format
+            lines.extend(f"{amp}\n" for amp in filtered_amps)
+            with open(new_file_path, 'w') as f:
+                f.writelines(lines)
+        
+        # I/O bound: overlap reads and writes across a thread pool
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        import os
+        
+        num_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = {
+                executor.submit(process_waveform, i, wf_path): wf_path
+                for i, wf_path in enumerate(waveform_data.waveform_files)
+            }
+            
+            completed = 0
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    success_count += 1
+                except Exception as e:
+                    print(f"Error procesando {futures[future].name}: {e}")
+                    error_count += 1
                 
                 # Progress update every 100 files
-                if (i + 1) % 100 == 0:
-                    print(f"Procesados: {i + 1}/{state['total_waveforms']}")
-                    
-            except Exception as e:
-                print(f"Error procesando {wf_path.name}: {e}")
-                error_count += 1
+                completed += 1
+                if completed % 100 == 0:
+                    print(f"Procesados: {completed}/{state['total_waveforms']}")
         
         print(f"\n{'='*60}")
         print(f"Proceso completado!")
@@ -4,11 +4,17 @@ Tabbed comparison window for comparing two datasets across multiple aspects.
 import customtkinter as ctk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection
 import numpy as np
 from pathlib import Path
 import threading
 import queue
 
+from utils.plotting import downsample_for_display, build_segments, sample_for_display
+
+# Resolution of the waveform overlay canvases (many lines: fewer pixels to rasterize)
+WAVEFORM_SCREEN_DPI = 72
+
 
 class TabbedComparisonWindow(ctk.CTkToplevel):
     """Window with tabs for different comparison aspects."""
@@ -232,8 +238,8 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
             ax2.set_ylabel("Amplitud (mV)", fontsize=9)
             ax2.grid(True, alpha=0.3)
         
-        canvas1.draw()
-        canvas2.draw()
+        canvas1.draw_idle()
+        canvas2.draw_idle()
         
         # Update info
         info_text = ""
@@ -297,7 +303,7 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
         
         canvas = FigureCanvasTkAgg(fig, master=tab)
         canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
-        canvas.draw()
+        canvas.draw_idle()
     
     def _create_temporal_distribution_tab(self):
         """Create temporal distribution + FFT comparison tab."""
@@ -309,30 +315,24 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
         tab.grid_rowconfigure(0, weight=1)
         
         from config import WINDOW_TIME, SAMPLE_TIME
+        from models.sipm_jit import flatten_peaks, collect_global_peaks
         
         def get_temporal_data(controller):
             """Get temporal distribution data (diffs vs amplitudes)."""
-            all_global_peaks = []
             all_results = controller.results.accepted_results + controller.results.afterpulse_results
             
-            for res in all_results:
-                t_half = res.t_half
-                peaks_indices = res.peaks
-                amplitudes = res.amplitudes
-                t_start_window = t_half - (WINDOW_TIME / 2)
-                
-                for p_idx in peaks_indices:
-                    t_rel = p_idx * SAMPLE_TIME
-                    t_global = t_start_window + t_rel
-                    amp = amplitudes[p_idx]
-                    all_global_peaks.append((t_global, amp))
+            # Vectorized gather of every peak's global time and amplitude
+            t_halves, peak_offsets, peak_indices, peak_amps = flatten_peaks(all_results)
+            times, amps = collect_global_peaks(
+                t_halves, peak_offsets, peak_indices, peak_amps, SAMPLE_TIME, WINDOW_TIME
+            )
             
-            if len(all_global_peaks) < 2:
+            if times.size < 2:
                 return np.array([]), np.array([]), None
             
-            all_global_peaks.sort(key=lambda x: x[0])
-            times = np.array([p[0] for p in all_global_peaks])
-            amps = np.array([p[1] for p in all_global_peaks])
+            order = np.argsort(times, kind='stable')
+            times = times[order]
+            amps = amps[order]
             
             diffs = np.diff(times)
             amps_plot = amps[1:] * 1000  # Convert to mV
@@ -350,11 +350,14 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
         fig1.subplots_adjust(left=0.12, right=0.95, top=0.92, bottom=0.12)
         
         if len(diffs1) > 0:
-            ax1.scatter(diffs1, amps1, alpha=0.4, s=8, c='#3498db', label=self.data_dir1.name, edgecolors='none')
+            ax1.scatter(diffs1, amps1, alpha=0.4, s=8, c='#3498db', label=self.data_dir1.name, edgecolors='none',
+                        rasterized=True, zorder=-1)
         
         if len(diffs2) > 0:
-            ax1.scatter(diffs2, amps2, alpha=0.4, s=8, c='#e74c3c', label=self.data_dir2.name, edgecolors='none')
+            ax1.scatter(diffs2, amps2, alpha=0.4, s=8, c='#e74c3c', label=self.data_dir2.name, edgecolors='none',
+                        rasterized=True, zorder=-1)
         
+        ax1.set_rasterization_zorder(0)
         ax1.set_xscale('log')
         ax1.set_xlabel('Diferencia Temporal (s) [Log]')
         ax1.set_ylabel('Amplitud (mV)')
@@ -364,7 +367,7 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
         
         canvas1 = FigureCanvasTkAgg(fig1, master=tab)
         canvas1.get_tk_widget().grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-        canvas1.draw()
+        canvas1.draw_idle()
         
         # Right: FFT comparison
         fig2 = plt.Figure(figsize=(7, 6), dpi=100)
@@ -392,7 +395,7 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
         
         canvas2 = FigureCanvasTkAgg(fig2, master=tab)
         canvas2.get_tk_widget().grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
-        canvas2.draw()
+        canvas2.draw_idle()
     
     def _create_charge_histogram_tab(self):
         """Create charge histogram comparison tab."""
@@ -437,7 +440,7 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
         
         canvas = FigureCanvasTkAgg(fig, master=tab)
         canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
-        canvas.draw()
+        canvas.draw_idle()
     
     def _create_all_waveforms_tab(self):
         """Create all waveforms tab with toggle between overlay and distributed."""
@@ -558,13 +561,27 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
                 limit = int(total_available * self.wf_percentage)
                 limit = max(1, limit) if total_available > 0 else 0
                 
-                sampled_results = all_results[:limit]
+                sampled_results = sample_for_display(all_results, limit)
                 alpha, linewidth = get_plot_style(limit)
                 
-                for result in sampled_results:
-                    t_axis = (np.arange(len(result.amplitudes)) * SAMPLE_TIME - WINDOW_TIME/2) * 1e6
-                    ax.plot(t_axis, result.amplitudes * 1000, color=color, 
-                           linewidth=linewidth, alpha=alpha)
+                # All waveforms share the time axis; draw them as one collection
+                if len({len(result.amplitudes) for result in sampled_results}) == 1:
+                    # Equal lengths: decimate and convert all waveforms at once
+                    amplitudes = np.stack([result.amplitudes for result in sampled_results])
+                    segments = build_segments(amplitudes, -WINDOW_TIME / 2, SAMPLE_TIME)
+                else:
+                    segments = []
+                    t_axis = None
+                    for result in sampled_results:
+                        if t_axis is None or len(t_axis) != len(result.amplitudes):
+                            t_axis = (np.arange(len(result.amplitudes)) * SAMPLE_TIME - WINDOW_TIME/2) * 1e6
+                        # Min/max decimation keeps the envelope at screen resolution
+                        t_disp, a_disp = downsample_for_display(t_axis, result.amplitudes)
+                        segments.append(np.column_stack([t_disp, a_disp * 1000]))
+                
+                ax.add_collection(LineCollection(segments, colors=color, linewidths=linewidth,
+                                                 alpha=alpha, antialiased=True, rasterized=True))
+                ax.autoscale_view()
                 
                 ax.set_xlabel('Tiempo (µs)')
                 ax.set_ylabel('Amplitud (mV)')
@@ -573,24 +590,24 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
                 return limit
 
             # Dataset 1
-            fig1 = plt.Figure(figsize=(7, 6), dpi=100)
+            fig1 = plt.Figure(figsize=(7, 6), dpi=WAVEFORM_SCREEN_DPI)
             ax1 = fig1.add_subplot(111)
             fig1.subplots_adjust(left=0.1, right=0.95, top=0.92, bottom=0.1)
             plot_dataset(ax1, self.controller1, f"DS1: {self.data_dir1.name}", '#3498db')
             
             canvas1 = FigureCanvasTkAgg(fig1, master=plot_container)
             canvas1.get_tk_widget().grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-            canvas1.draw()
+            canvas1.draw_idle()
             
             # Dataset 2
-            fig2 = plt.Figure(figsize=(7, 6), dpi=100)
+            fig2 = plt.Figure(figsize=(7, 6), dpi=WAVEFORM_SCREEN_DPI)
             ax2 = fig2.add_subplot(111)
             fig2.subplots_adjust(left=0.1, right=0.95, top=0.92, bottom=0.1)
             plot_dataset(ax2, self.controller2, f"DS2: {self.data_dir2.name}", '#e74c3c')
             
             canvas2 = FigureCanvasTkAgg(fig2, master=plot_container)
             canvas2.get_tk_widget().grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
-            canvas2.draw()
+            canvas2.draw_idle()
             
             canvas_refs['overlay'] = [canvas1, canvas2]
         
@@ -602,7 +619,7 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
             plot_container.grid_columnconfigure(0, weight=1)
             plot_container.grid_columnconfigure(1, weight=0) # Hide 2nd column
             
-            fig = plt.Figure(figsize=(14, 8), dpi=100)
+            fig = plt.Figure(figsize=(14, 8), dpi=WAVEFORM_SCREEN_DPI)
             # Create two subplots vertically
             ax1 = fig.add_subplot(211)
             ax2 = fig.add_subplot(212, sharex=ax1) # Share x axis
@@ -621,15 +638,26 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
                 limit = int(total_available * self.wf_percentage)
                 limit = max(1, limit) if total_available > 0 else 0
                 
-                sampled_results = all_results[:limit]
+                sampled_results = sample_for_display(all_results, limit)
                 alpha, linewidth = get_plot_style(limit)
                 
-                for result in sampled_results:
-                    t_half = result.t_half
-                    t_start = t_half - (WINDOW_TIME / 2)
-                    t_global = t_start + (np.arange(len(result.amplitudes)) * SAMPLE_TIME)
-                    ax.plot(t_global * 1e6, result.amplitudes * 1000, 
-                           color=color, linewidth=linewidth, alpha=alpha)
+                t_start = np.fromiter((result.t_half for result in sampled_results),
+                                      dtype=np.float64, count=limit) - (WINDOW_TIME / 2)
+                
+                if len({len(result.amplitudes) for result in sampled_results}) == 1:
+                    # Equal lengths: decimate and convert all waveforms at once
+                    amplitudes = np.stack([result.amplitudes for result in sampled_results])
+                    segments = build_segments(amplitudes, t_start, SAMPLE_TIME)
+                else:
+                    segments = []
+                    for result, start in zip(sampled_results, t_start):
+                        t_global = start + (np.arange(len(result.amplitudes)) * SAMPLE_TIME)
+                        t_disp, a_disp = downsample_for_display(t_global, result.amplitudes)
+                        segments.append(np.column_stack([t_disp * 1e6, a_disp * 1000]))
+                
+                ax.add_collection(LineCollection(segments, colors=color, linewidths=linewidth,
+                                                 alpha=alpha, antialiased=True, rasterized=True))
+                ax.autoscale_view()
                 
                 ax.set_ylabel('Amplitud (mV)', fontsize=10)
                 ax.set_title(f'{name} - Temporal Global ({limit}/{total_available})', fontsize=11)
@@ -644,7 +672,7 @@ class TabbedComparisonWindow(ctk.CTkToplevel):
             
             canvas = FigureCanvasTkAgg(fig, master=plot_container)
             canvas.get_tk_widget().grid(row=0, column=0, columnspan=2, sticky="nsew")
-            canvas.draw()
+            canvas.draw_idle()
             
             canvas_refs['distributed'] = canvas
         
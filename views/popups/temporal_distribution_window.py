@@ -3,15 +3,13 @@ Temporal distribution analysis window.
 """
 import customtkinter as ctk
 import tkinter as tk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.widgets import RectangleSelector
 import numpy as np
 
-from config import WINDOW_TIME, SAMPLE_TIME
+from config import WINDOW_TIME, SAMPLE_TIME, USE_DATASHADER_SCATTER, TEMPORAL_DENSITY_MIN_POINTS
 from utils import get_config, ResultsExporter
 from utils.plotting import save_figure
 from models.signal_processing import SiPMAnalyzer
+from models.sipm_jit import flatten_peaks, collect_global_peaks
 from views.popups.base_popup import BasePopup
 
 def show_temporal_distribution(parent, accepted_results, afterpulse_results):
@@ -26,6 +24,12 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
     if not accepted_results:
         return
     
+    # Matplotlib is imported on first use to keep application start-up light
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.widgets import RectangleSelector
+    from matplotlib.colors import to_rgba
+    
     # Create window
     window = BasePopup(parent, "Distribución Temporal Global - Análisis SiPM", 1400, 700)
     
@@ -50,59 +54,36 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
     metrics_frame.grid(row=0, column=2, sticky="nsew", padx=(5, 0))
     
     # Collect all valid peaks with global times
-    all_global_peaks = []
     all_results = accepted_results + afterpulse_results
     
-    for res in all_results:
-        t_half = res.t_half
-        peaks_indices = res.peaks
-        amplitudes = res.amplitudes
-        
-        t_start_window = t_half - (WINDOW_TIME / 2)
-        
-        for p_idx in peaks_indices:
-            t_rel = p_idx * SAMPLE_TIME
-            t_global = t_start_window + t_rel
-            amp = amplitudes[p_idx]
-            all_global_peaks.append((t_global, amp))
+    t_halves, peak_offsets, peak_indices, peak_amps = flatten_peaks(all_results)
+    global_times, global_amps = collect_global_peaks(
+        t_halves, peak_offsets, peak_indices, peak_amps, SAMPLE_TIME, WINDOW_TIME
+    )
     
-    if len(all_global_peaks) < 2:
+    if global_times.size < 2:
         print("No hay suficientes picos para generar la distribución.")
         window.destroy()
         return
     
-    # Sort by global time
-    all_global_peaks.sort(key=lambda x: x[0])
+    # Sort by global time (stable, so ties keep result order)
+    order = np.argsort(global_times, kind='stable')
+    times = global_times[order]
+    amps = global_amps[order]
     
     # Calculate differences
-    times = np.array([p[0] for p in all_global_peaks])
-    amps = np.array([p[1] for p in all_global_peaks])
-    
     diffs = np.diff(times)
     amps_plot = amps[1:] * 1000  # Convert to mV
     
-    # Create mapping from peak index to waveform result
+    # Map each sorted peak to the index of its waveform result
     # This allows us to find which waveform a selected peak belongs to
-    peak_to_waveform = []
-    for res in all_results:
-        t_half = res.t_half
-        peaks_indices = res.peaks
-        amplitudes = res.amplitudes
-        t_start_window = t_half - (WINDOW_TIME / 2)
-        
-        for p_idx in peaks_indices:
-            t_rel = p_idx * SAMPLE_TIME
-            t_global = t_start_window + t_rel
-            amp = amplitudes[p_idx]
-            # Store: (diff_time, amplitude_mV, waveform_result)
-            peak_to_waveform.append((t_global, amp * 1000, res))
-    
-    # Sort by global time to match diffs array
-    peak_to_waveform.sort(key=lambda x: x[0])
+    peak_owner = np.repeat(np.arange(len(all_results)), np.diff(peak_offsets))[order]
     
     # Variables to store current canvas and metrics widgets
-    canvas_ref = {'canvas': None, 'fig': None, 'selector': None}
-    metrics_widgets = {'widgets': [], 'metrics': None}  # Store metrics object
+    canvas_ref = {'canvas': None, 'fig': None, 'ax': None, 'selector': None,
+                  'points': None, 'legend_proxies': None, 'hline': None, 'vline': None,
+                  'background': None, 'labels': None, 'legend_handles': None}
+    metrics_widgets = {'labels': {}, 'metrics': None}  # Persistent labels and metrics object
     
     # Selection state
     selection_state = {
@@ -112,141 +93,134 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
         'bounds': None  # (time_min, time_max, amp_min, amp_max)
     }
     
-    def update_metrics_display(metrics):
-        """Update the metrics panel with new values."""
-        # Clear existing metrics widgets
-        for widget in metrics_widgets['widgets']:
-            widget.destroy()
-        metrics_widgets['widgets'].clear()
+    def build_metrics_display():
+        """Create the metrics panel widgets once; values are set in update_metrics_display."""
+        labels = metrics_widgets['labels']
         
         # Total events
-        total_label = ctk.CTkLabel(
+        labels['total'] = ctk.CTkLabel(
             metrics_frame,
-            text=f"Total de Eventos: {metrics.total_events:,}",
+            text="",
             font=ctk.CTkFont(size=12, weight="bold")
         )
-        total_label.pack(pady=(0, 15))
-        metrics_widgets['widgets'].append(total_label)
-        
-        # Crosstalk section
-        xt_frame = ctk.CTkFrame(metrics_frame, fg_color="#2b2b2b")
-        xt_frame.pack(fill="x", padx=10, pady=5)
-        metrics_widgets['widgets'].append(xt_frame)
-        
-        xt_title = ctk.CTkLabel(xt_frame, text="Crosstalk (XT)", 
-                               font=ctk.CTkFont(size=13, weight="bold"))
-        xt_title.pack(pady=(10, 5))
-        
-        xt_pct = ctk.CTkLabel(xt_frame, text=f"{metrics.crosstalk_pct:.2f}%",
-                             font=ctk.CTkFont(size=20, weight="bold"),
-                             text_color="#e74c3c")
-        xt_pct.pack()
-        
-        xt_count = ctk.CTkLabel(xt_frame, text=f"Eventos: {metrics.crosstalk_count:,}",
-                               font=ctk.CTkFont(size=10))
-        xt_count.pack(pady=(0, 10))
-        
-        # Afterpulses section
-        ap_frame = ctk.CTkFrame(metrics_frame, fg_color="#2b2b2b")
-        ap_frame.pack(fill="x", padx=10, pady=5)
-        metrics_widgets['widgets'].append(ap_frame)
-        
-        ap_title = ctk.CTkLabel(ap_frame, text="Afterpulses (AP)",
-                               font=ctk.CTkFont(size=13, weight="bold"))
-        ap_title.pack(pady=(10, 5))
-        
-        ap_pct = ctk.CTkLabel(ap_frame, text=f"{metrics.afterpulse_pct:.2f}%",
-                             font=ctk.CTkFont(size=20, weight="bold"),
-                             text_color="#2ecc71")
-        ap_pct.pack()
-        
-        ap_count = ctk.CTkLabel(ap_frame, text=f"Eventos: {metrics.afterpulse_count:,}",
-                               font=ctk.CTkFont(size=10))
-        ap_count.pack(pady=(0, 10))
-        
-        # AP + XT section
-        ap_xt_frame = ctk.CTkFrame(metrics_frame, fg_color="#2b2b2b")
-        ap_xt_frame.pack(fill="x", padx=10, pady=5)
-        metrics_widgets['widgets'].append(ap_xt_frame)
-        
-        ap_xt_title = ctk.CTkLabel(ap_xt_frame, text="AP + XT",
-                                  font=ctk.CTkFont(size=13, weight="bold"))
-        ap_xt_title.pack(pady=(10, 5))
-        
-        ap_xt_pct = ctk.CTkLabel(ap_xt_frame, text=f"{metrics.crosstalk_afterpulse_pct:.2f}%",
-                                font=ctk.CTkFont(size=20, weight="bold"),
-                                text_color="#ff9500")
-        ap_xt_pct.pack()
-        
-        ap_xt_count = ctk.CTkLabel(ap_xt_frame, text=f"Eventos: {metrics.crosstalk_afterpulse_count:,}",
-                                  font=ctk.CTkFont(size=10))
-        ap_xt_count.pack(pady=(0, 10))
+        labels['total'].pack(pady=(0, 15))
+        
+        # Crosstalk, Afterpulses and AP + XT sections share the same layout
+        sections = [
+            ('xt', "Crosstalk (XT)", "#e74c3c"),
+            ('ap', "Afterpulses (AP)", "#2ecc71"),
+            ('ap_xt', "AP + XT", "#ff9500"),
+        ]
+        for key, title, color in sections:
+            frame = ctk.CTkFrame(metrics_frame, fg_color="#2b2b2b")
+            frame.pack(fill="x", padx=10, pady=5)
+            
+            ctk.CTkLabel(frame, text=title,
+                        font=ctk.CTkFont(size=13, weight="bold")).pack(pady=(10, 5))
+            
+            labels[f'{key}_pct'] = ctk.CTkLabel(frame, text="",
+                                                font=ctk.CTkFont(size=20, weight="bold"),
+                                                text_color=color)
+            labels[f'{key}_pct'].pack()
+            
+            labels[f'{key}_count'] = ctk.CTkLabel(frame, text="",
+                                                  font=ctk.CTkFont(size=10))
+            labels[f'{key}_count'].pack(pady=(0, 10))
         
         # DCR section
         dcr_frame = ctk.CTkFrame(metrics_frame, fg_color="#2b2b2b")
         dcr_frame.pack(fill="x", padx=10, pady=5)
-        metrics_widgets['widgets'].append(dcr_frame)
         
         dcr_title = ctk.CTkLabel(dcr_frame, text="DCR (Dark Count Rate)",
                                 font=ctk.CTkFont(size=13, weight="bold"))
         dcr_title.pack(pady=(10, 5))
         
+        # Both DCR calculation methods (shown only when there are DCR events)
+        dcr_values = ctk.CTkFrame(dcr_frame, fg_color="transparent")
+        labels['dcr_values'] = dcr_values
+        
+        # Method 1: Total rate
+        labels['dcr_total'] = ctk.CTkLabel(
+            dcr_values,
+            text="",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color="#3498db"
+        )
+        labels['dcr_total'].pack()
+        
+        ctk.CTkLabel(
+            dcr_values,
+            text="(eventos / tiempo total)",
+            font=ctk.CTkFont(size=9),
+            text_color="gray"
+        ).pack()
+        
+        # Method 2: Average rate
+        labels['dcr_avg'] = ctk.CTkLabel(
+            dcr_values,
+            text="",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color="#9b59b6"
+        )
+        labels['dcr_avg'].pack(pady=(5, 0))
+        
+        ctk.CTkLabel(
+            dcr_values,
+            text="(1 / intervalo promedio)",
+            font=ctk.CTkFont(size=9),
+            text_color="gray"
+        ).pack()
+        
+        # Explanation of difference
+        labels['dcr_diff'] = ctk.CTkLabel(
+            dcr_values,
+            text="",
+            font=ctk.CTkFont(size=9),
+            text_color="#e67e22"
+        )
+        labels['dcr_diff'].pack(pady=(5, 0))
+        
+        labels['dcr_placeholder'] = ctk.CTkLabel(dcr_frame, text="Sin eventos DCR",
+                                                font=ctk.CTkFont(size=12),
+                                                text_color="gray")
+        
+        labels['dcr_count'] = ctk.CTkLabel(dcr_frame, text="",
+                                          font=ctk.CTkFont(size=10))
+        labels['dcr_count'].pack(pady=(5, 10))
+    
+    def update_metrics_display(metrics):
+        """Update the metrics panel with new values."""
+        labels = metrics_widgets['labels']
+        
+        labels['total'].configure(text=f"Total de Eventos: {metrics.total_events:,}")
+        
+        labels['xt_pct'].configure(text=f"{metrics.crosstalk_pct:.2f}%")
+        labels['xt_count'].configure(text=f"Eventos: {metrics.crosstalk_count:,}")
+        
+        labels['ap_pct'].configure(text=f"{metrics.afterpulse_pct:.2f}%")
+        labels['ap_count'].configure(text=f"Eventos: {metrics.afterpulse_count:,}")
+        
+        labels['ap_xt_pct'].configure(text=f"{metrics.crosstalk_afterpulse_pct:.2f}%")
+        labels['ap_xt_count'].configure(text=f"Eventos: {metrics.crosstalk_afterpulse_count:,}")
+        
         # Display both DCR calculation methods
         if metrics.dcr_count > 0 and metrics.dcr_rate_total_hz > 0:
-            # Method 1: Total rate
             dcr_total_display = f"{metrics.dcr_rate_total_hz:.1f} Hz" if metrics.dcr_rate_total_hz < 1000 else f"{metrics.dcr_rate_total_hz/1000:.2f} kHz"
-            dcr_total_label = ctk.CTkLabel(
-                dcr_frame, 
-                text=f"Método 1: {dcr_total_display}",
-                font=ctk.CTkFont(size=16, weight="bold"),
-                text_color="#3498db"
-            )
-            dcr_total_label.pack()
+            labels['dcr_total'].configure(text=f"Método 1: {dcr_total_display}")
             
-            dcr_total_desc = ctk.CTkLabel(
-                dcr_frame,
-                text="(eventos / tiempo total)",
-                font=ctk.CTkFont(size=9),
-                text_color="gray"
-            )
-            dcr_total_desc.pack()
-            
-            # Method 2: Average rate
             dcr_avg_display = f"{metrics.dcr_rate_avg_hz:.1f} Hz" if metrics.dcr_rate_avg_hz < 1000 else f"{metrics.dcr_rate_avg_hz/1000:.2f} kHz"
-            dcr_avg_label = ctk.CTkLabel(
-                dcr_frame,
-                text=f"Método 2: {dcr_avg_display}",
-                font=ctk.CTkFont(size=16, weight="bold"),
-                text_color="#9b59b6"
-            )
-            dcr_avg_label.pack(pady=(5, 0))
-            
-            dcr_avg_desc = ctk.CTkLabel(
-                dcr_frame,
-                text="(1 / intervalo promedio)",
-                font=ctk.CTkFont(size=9),
-                text_color="gray"
-            )
-            dcr_avg_desc.pack()
+            labels['dcr_avg'].configure(text=f"Método 2: {dcr_avg_display}")
             
-            # Explanation of difference
             diff_pct = abs(metrics.dcr_rate_total_hz - metrics.dcr_rate_avg_hz) / metrics.dcr_rate_total_hz * 100
-            diff_label = ctk.CTkLabel(
-                dcr_frame,
-                text=f"Diferencia: {diff_pct:.1f}%",
-                font=ctk.CTkFont(size=9),
-                text_color="#e67e22"
-            )
-            diff_label.pack(pady=(5, 0))
+            labels['dcr_diff'].configure(text=f"Diferencia: {diff_pct:.1f}%")
+            
+            labels['dcr_placeholder'].pack_forget()
+            labels['dcr_values'].pack(before=labels['dcr_count'])
         else:
-            dcr_placeholder = ctk.CTkLabel(dcr_frame, text="Sin eventos DCR",
-                                          font=ctk.CTkFont(size=12),
-                                          text_color="gray")
-            dcr_placeholder.pack()
+            labels['dcr_values'].pack_forget()
+            labels['dcr_placeholder'].pack(before=labels['dcr_count'])
         
-        dcr_count_label = ctk.CTkLabel(dcr_frame, text=f"Eventos: {metrics.dcr_count:,}",
-                                      font=ctk.CTkFont(size=10))
-        dcr_count_label.pack(pady=(5, 10))
+        labels['dcr_count'].configure(text=f"Eventos: {metrics.dcr_count:,}")
     
     def on_rectangle_select(eclick, erelease):
         """Handle rectangle selection on scatter plot."""
@@ -261,13 +235,10 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
             return
         
         # Filter waveforms within selection
-        # Note: peak_to_waveform[i+1] corresponds to diffs[i] and amps_plot[i]
-        filtered = set()
-        for i in range(len(diffs)):
-            if x1 <= diffs[i] <= x2 and y1 <= amps_plot[i] <= y2:
-                # Get the waveform result for this peak
-                _, _, wf_result = peak_to_waveform[i + 1]  # +1 because diffs is diff of times
-                filtered.add(wf_result.filename)
+        # Note: peak_owner[i+1] corresponds to diffs[i] and amps_plot[i]
+        in_region = (x1 <= diffs) & (diffs <= x2) & (y1 <= amps_plot) & (amps_plot <= y2)
+        selected_owners = np.unique(peak_owner[1:][in_region])  # +1 because diffs is diff of times
+        filtered = {all_results[i].filename for i in selected_owners}
         
         # Convert to list of results
         selection_state['filtered_results'] = [r for r in all_results if r.filename in filtered]
@@ -295,63 +266,125 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
         # Selection cleared
         print("Selection cleared")
 
-    def update_plot(amp_threshold, time_threshold):
-        """Update plot and metrics with new thresholds."""
-        # Perform SiPM analysis with new thresholds
-        analyzer = SiPMAnalyzer(amplitude_threshold_mV=amp_threshold, 
-                               time_threshold_s=time_threshold)
-        metrics = analyzer.analyze(diffs, amps_plot)
-        
-        # Store metrics for export
-        metrics_widgets['metrics'] = metrics
-        
-        # Clear previous plot if exists
-        if canvas_ref['canvas'] is not None:
-            canvas_ref['canvas'].get_tk_widget().destroy()
-        
-        # Create new plot
+    # Scatter styling per region, in quadrant label order: (mask attribute, color, label)
+    region_styles = [
+        ('dcr_mask', '#1f77b4', 'DCR'),                          # bottom-right
+        ('afterpulse_mask', '#2ecc71', 'Afterpulses'),           # bottom-left
+        ('crosstalk_mask', '#e74c3c', 'Crosstalk'),              # top-right
+        ('crosstalk_afterpulse_mask', '#ff9500', 'AP + XT'),     # top-left
+    ]
+    # RGBA per quadrant label; the extra last row (label -1) keeps unclassified points transparent
+    region_palette = np.array([to_rgba(color, alpha=0.6) for _, color, _ in region_styles] + [(0, 0, 0, 0)])
+    
+    # Data extent used for autoscaling (collections are not included by relim)
+    positive_diffs = diffs[diffs > 0]
+    data_corners = np.array([
+        [positive_diffs.min() if positive_diffs.size else diffs.min(), amps_plot.min()],
+        [diffs.max(), amps_plot.max()]
+    ])
+    
+    # Optional datashader rendering of the points (static image aggregated per pixel)
+    use_datashader = USE_DATASHADER_SCATTER
+    if use_datashader:
+        try:
+            import pandas as pd
+            import datashader as ds
+            import datashader.transfer_functions as tf
+        except ImportError:
+            print("datashader no está instalado; usando scatter de matplotlib")
+            use_datashader = False
+    
+    def shade_points(labels):
+        """Aggregate the classified points per pixel with datashader and return an RGBA image."""
+        valid = (labels >= 0) & (diffs > 0)  # Classified and drawable on the log axis
+        df = pd.DataFrame({
+            'diff': diffs[valid],
+            'amp': amps_plot[valid],
+            'region': pd.Categorical(labels[valid], categories=range(len(region_styles))),
+        })
+        cvs = ds.Canvas(plot_width=1200, plot_height=700,
+                        x_range=tuple(data_corners[:, 0]), y_range=tuple(data_corners[:, 1]),
+                        x_axis_type='log')
+        agg = cvs.points(df, 'diff', 'amp', ds.count_cat('region'))
+        color_key = {i: color for i, (_, color, _) in enumerate(region_styles)}
+        img = tf.shade(agg, color_key=color_key, how='eq_hist')
+        # Packed uint32 RGBA -> (rows, cols, 4) uint8, first row at the lowest amplitude
+        return img.to_numpy().view(np.uint8).reshape(img.shape + (4,))
+    
+    # Density mode: pre-bin the peaks once on a (log delta t, amplitude) grid and draw
+    # one marker per occupied cell; thresholds only change the cell colors
+    density_mode = not use_datashader and diffs.size > TEMPORAL_DENSITY_MIN_POINTS
+    if density_mode:
+        n_x_bins, n_y_bins = 300, 200
+        binnable = (diffs > 0) & np.isfinite(amps_plot)
+        log_x = np.log10(diffs[binnable])
+        y = amps_plot[binnable]
+        x_edges = np.linspace(log_x.min(), log_x.max(), n_x_bins + 1)
+        y_edges = np.linspace(y.min(), y.max(), n_y_bins + 1)
+        ix = np.clip(np.digitize(log_x, x_edges) - 1, 0, n_x_bins - 1)
+        iy = np.clip(np.digitize(y, y_edges) - 1, 0, n_y_bins - 1)
+        _, bin_of_point = np.unique(ix * n_y_bins + iy, return_inverse=True)
+        bin_of_point = bin_of_point.ravel()
+        
+        # Cell marker at the mean position of its peaks, sized by peak count
+        bin_counts = np.bincount(bin_of_point)
+        bin_x = 10 ** (np.bincount(bin_of_point, weights=log_x) / bin_counts)
+        bin_y = np.bincount(bin_of_point, weights=y) / bin_counts
+        bin_sizes = np.clip(4 * np.sqrt(bin_counts), 4, 60)
+        print(f"Distribución temporal: {diffs.size:,} picos agrupados en {bin_counts.size:,} celdas")
+    
+    def bin_colors(labels):
+        """Color each density cell by the majority quadrant label of its peaks."""
+        cell_labels = labels[binnable]
+        classified = cell_labels >= 0
+        votes = np.bincount(bin_of_point[classified] * 4 + cell_labels[classified],
+                            minlength=bin_counts.size * 4).reshape(-1, 4)
+        majority = votes.argmax(axis=1)
+        majority[votes.sum(axis=1) == 0] = -1  # Transparent palette row
+        return region_palette[majority]
+    
+    def create_plot():
+        """Create the persistent figure, artists, selector and context menu."""
         fig = plt.Figure(figsize=(8, 6), dpi=100)
         ax = fig.add_subplot(111)
         
-        # Plot points colored by region
-        # DCR (bottom-right) - blue
-        if metrics.dcr_mask is not None and np.any(metrics.dcr_mask):
-            ax.scatter(diffs[metrics.dcr_mask], amps_plot[metrics.dcr_mask], 
-                      alpha=0.6, s=15, c='#1f77b4', label='DCR', edgecolors='none')
-        
-        # Afterpulses (bottom-left) - green
-        if metrics.afterpulse_mask is not None and np.any(metrics.afterpulse_mask):
-            ax.scatter(diffs[metrics.afterpulse_mask], amps_plot[metrics.afterpulse_mask],
-                      alpha=0.6, s=15, c='#2ecc71', label='Afterpulses', edgecolors='none')
-        
-        # Crosstalk (top-right) - red
-        if metrics.crosstalk_mask is not None and np.any(metrics.crosstalk_mask):
-            ax.scatter(diffs[metrics.crosstalk_mask], amps_plot[metrics.crosstalk_mask],
-                      alpha=0.6, s=15, c='#e74c3c', label='Crosstalk', edgecolors='none')
-        
-        # AP + XT (top-left) - orange
-        if metrics.crosstalk_afterpulse_mask is not None and np.any(metrics.crosstalk_afterpulse_mask):
-            ax.scatter(diffs[metrics.crosstalk_afterpulse_mask], amps_plot[metrics.crosstalk_afterpulse_mask],
-                      alpha=0.6, s=15, c='#ff9500', label='AP + XT', edgecolors='none')
-        
-        # Draw threshold lines
-        # Horizontal line (amplitude threshold)
-        ax.axhline(y=metrics.amplitude_threshold, color='red', linestyle='--', 
-                  linewidth=2, label=f'Threshold Amp: {metrics.amplitude_threshold:.1f} mV')
-        
-        # Vertical line (time threshold)
-        ax.axvline(x=metrics.time_threshold, color='purple', linestyle='--',
-                  linewidth=2, label=f'Threshold Time: {metrics.time_threshold*1e6:.1f} µs')
+        if use_datashader:
+            # Image spanning the data extent; its pixels are log-spaced like the x axis
+            (x0, y0), (x1, y1) = data_corners
+            points = ax.imshow(np.zeros((1, 1, 4), dtype=np.uint8), origin='lower', aspect='auto',
+                               interpolation='nearest', extent=(x0, x1, y0, y1), zorder=-1)
+        elif density_mode:
+            points = ax.scatter(bin_x, bin_y, s=bin_sizes, edgecolors='none', rasterized=True, zorder=-1)
+        else:
+            # One marker-only Line2D per region (single-color draw_markers fast path);
+            # their data is set in update_plot. Equivalent to scatter size s=15.
+            # Rasterized below zorder 0 so lines, legend and grid stay vector in exports
+            points = [
+                ax.plot([], [], linestyle='none', marker='o', markersize=np.sqrt(15),
+                        markeredgecolor='none', markerfacecolor=color, alpha=0.6,
+                        rasterized=True, zorder=-1)[0]
+                for _, color, _ in region_styles
+            ]
+        ax.set_rasterization_zorder(0)
+        
+        # Empty proxy artists carry the legend entry of each region
+        legend_proxies = []
+        for _, color, label in region_styles:
+            proxy = ax.scatter([], [], alpha=0.6, s=15, c=color, label=label, edgecolors='none')
+            legend_proxies.append(proxy)
+        
+        # Threshold lines (positions are updated in update_plot)
+        # Animated: they are drawn over a cached background so moving them can be blitted
+        hline = ax.axhline(y=0, color='red', linestyle='--', linewidth=2, animated=True)
+        vline = ax.axvline(x=1, color='purple', linestyle='--', linewidth=2, animated=True)
         
         ax.set_xscale('log')
         ax.set_xlabel("Diferencia Temporal entre Picos Consecutivos (s) [Log]", fontsize=10)
         ax.set_ylabel("Amplitud del pico (mV)", fontsize=10)
         ax.set_title("Amplitud vs Delta T (Global) - Análisis SiPM", fontsize=12, weight='bold')
         ax.grid(True, which="both", ls="-", alpha=0.2)
-        ax.legend(loc='upper right', fontsize=8)
         
         canvas = FigureCanvasTkAgg(fig, master=plot_frame)
-        canvas.draw()
         canvas.get_tk_widget().pack(fill="both", expand=True)
         
         # Add rectangle selector for interactive selection
@@ -367,16 +400,41 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
             props=dict(facecolor='yellow', edgecolor='orange', alpha=0.3, fill=True)
         )
         
+        def on_draw(event):
+            """Cache the background after each full draw and paint the animated artists."""
+            if not hline.get_animated():
+                return  # Saving: the threshold artists are part of the normal draw
+            canvas_ref['background'] = canvas.copy_from_bbox(ax.bbox)
+            draw_threshold_artists()
+        
+        canvas.mpl_connect('draw_event', on_draw)
+        
         # Store references
         canvas_ref['canvas'] = canvas
         canvas_ref['fig'] = fig
+        canvas_ref['ax'] = ax
         canvas_ref['selector'] = selector
+        canvas_ref['points'] = points
+        canvas_ref['legend_proxies'] = legend_proxies
+        canvas_ref['hline'] = hline
+        canvas_ref['vline'] = vline
         
         # Setup context menu for this plot
         context_menu = tk.Menu(window, tearoff=0)
         
         def save_plot(fmt):
-            save_figure(fig, default_prefix="temporal_dist")
+            # Animated artists are skipped by savefig, so draw them normally while saving
+            animated = [hline, vline, ax.get_legend()]
+            for artist in animated:
+                if artist is not None:
+                    artist.set_animated(False)
+            try:
+                save_figure(fig, default_prefix="temporal_dist")
+            finally:
+                for artist in animated:
+                    if artist is not None:
+                        artist.set_animated(True)
+                canvas.draw_idle()
 
         context_menu.add_command(label="💾 Guardar como PNG", command=lambda: save_plot("png"))
         context_menu.add_command(label="💾 Guardar como PDF", command=lambda: save_plot("pdf"))
@@ -389,18 +447,132 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
                 context_menu.grab_release()
                 
         canvas.get_tk_widget().bind("<Button-3>", show_context_menu)
+
+    # Single analyzer reused for every threshold update
+    analyzer = SiPMAnalyzer()
+    
+    # Label buffers reused across updates; two of them so the previous labels
+    # stay intact for the change check in update_plot
+    label_buffers = [np.empty(diffs.size, dtype=np.int8) for _ in range(2)]
+    
+    def draw_threshold_artists():
+        """Draw the animated threshold lines and legend onto the canvas."""
+        ax = canvas_ref['ax']
+        for artist in (canvas_ref['hline'], canvas_ref['vline'], ax.get_legend()):
+            if artist is not None:
+                ax.draw_artist(artist)
+    
+    def update_plot(amp_threshold, time_threshold):
+        """Update plot and metrics with new thresholds."""
+        # Perform SiPM analysis with new thresholds
+        label_buffers.reverse()
+        metrics = analyzer.analyze(diffs, amps_plot,
+                                   amp_threshold_mV=amp_threshold,
+                                   time_threshold_s=time_threshold,
+                                   labels_out=label_buffers[0])
+        
+        # Store metrics for export
+        metrics_widgets['metrics'] = metrics
+        
+        ax = canvas_ref['ax']
+        
+        # Update point colors by region with a single palette lookup on the labels
+        legend_handles = []
+        for proxy, (mask_name, _, _) in zip(canvas_ref['legend_proxies'], region_styles):
+            mask = getattr(metrics, mask_name)
+            if mask is not None and np.any(mask):
+                legend_handles.append(proxy)
+        previous_labels = canvas_ref['labels']
+        labels_changed = (metrics.labels is None or previous_labels is None
+                          or not np.array_equal(metrics.labels, previous_labels))
+        if labels_changed and metrics.labels is not None:
+            if use_datashader:
+                canvas_ref['points'].set_data(shade_points(metrics.labels))
+            elif density_mode:
+                canvas_ref['points'].set_facecolors(bin_colors(metrics.labels))
+            else:
+                for line, (mask_name, _, _) in zip(canvas_ref['points'], region_styles):
+                    mask = getattr(metrics, mask_name)
+                    line.set_data(diffs[mask], amps_plot[mask])
+        canvas_ref['labels'] = metrics.labels
+        
+        # Update threshold lines
+        hline = canvas_ref['hline']
+        hline.set_ydata([metrics.amplitude_threshold] * 2)
+        hline.set_label(f'Threshold Amp: {metrics.amplitude_threshold:.1f} mV')
+        
+        vline = canvas_ref['vline']
+        vline.set_xdata([metrics.time_threshold] * 2)
+        vline.set_label(f'Threshold Time: {metrics.time_threshold*1e6:.1f} µs')
+        legend_handles.extend([hline, vline])
+        
+        # Rescale to data plus threshold lines
+        old_limits = (ax.get_xlim(), ax.get_ylim())
+        ax.relim(visible_only=True)
+        ax.update_datalim(data_corners)
+        ax.autoscale_view()
+        limits_changed = old_limits != (ax.get_xlim(), ax.get_ylim())
+        
+        # Rebuild the legend only when its entries change; otherwise just update the threshold texts
+        legend = ax.get_legend()
+        if legend is None or canvas_ref['legend_handles'] != legend_handles:
+            legend = ax.legend(handles=legend_handles, loc='upper right', fontsize=8)
+            legend.set_animated(True)
+            canvas_ref['legend_handles'] = legend_handles
+        else:
+            legend_texts = legend.get_texts()
+            legend_texts[-2].set_text(hline.get_label())
+            legend_texts[-1].set_text(vline.get_label())
+        
+        canvas = canvas_ref['canvas']
+        background = canvas_ref['background']
+        if labels_changed or limits_changed or background is None:
+            canvas.draw_idle()
+        else:
+            # Only the threshold lines and legend moved: blit them over the cached scatter
+            canvas.restore_region(background)
+            draw_threshold_artists()
+            canvas.blit(ax.bbox)
         
         # Update metrics display
         update_metrics_display(metrics)
     
-    def on_update_button():
-        """Handle update button click."""
+    # Debounced update state: only the latest request within the delay runs
+    pending_update = {'id': None, 'last': None}
+    
+    def run_update(quiet=False):
+        """Parse the threshold entries and update the plot."""
+        pending_update['id'] = None
+        if not window.winfo_exists():
+            return
         try:
             amp_val = float(amp_entry.get())
             time_val = float(time_entry.get()) * 1e-6  # Convert from µs to s
-            update_plot(amp_val, time_val)
         except ValueError:
-            print("Error: Por favor ingresa valores numéricos válidos")
+            # Partial input while typing is expected, only report explicit requests
+            if not quiet:
+                print("Error: Por favor ingresa valores numéricos válidos")
+            return
+        
+        if quiet and pending_update['last'] == (amp_val, time_val):
+            return
+        pending_update['last'] = (amp_val, time_val)
+        update_plot(amp_val, time_val)
+    
+    def schedule_update(quiet=False, delay_ms=150):
+        """Schedule a plot update, cancelling any pending one."""
+        if pending_update['id'] is not None:
+            window.after_cancel(pending_update['id'])
+        pending_update['id'] = window.after(delay_ms, lambda: run_update(quiet))
+    
+    def on_update_button():
+        """Handle update button click."""
+        schedule_update()
+    
+    def on_entry_key(event):
+        """Handle typing in the threshold entries."""
+        if event.keysym not in ("Return", "KP_Enter"):
+            schedule_update(quiet=True)
     
     def on_save_config():
         """Save current threshold values to configuration."""
@@ -466,6 +638,11 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
     time_entry.insert(0, str(saved_thresholds['time_threshold_us']))
     time_entry.pack(pady=(0, 10), padx=10)
     
+    # Update on Enter and (debounced) while typing
+    for entry in (amp_entry, time_entry):
+        entry.bind("<Return>", lambda e: schedule_update())
+        entry.bind("<KeyRelease>", on_entry_key)
+    
     # Update button
     update_button = ctk.CTkButton(
         controls_frame,
@@ -614,6 +791,8 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
     )
     metrics_title.pack(pady=(10, 10))
     
+    build_metrics_display()
+    
     # Export button
     def on_export():
         """Export SiPM metrics."""
@@ -744,5 +923,7 @@ def show_temporal_distribution(parent, accepted_results, afterpulse_results):
     )
     export_btn.pack(pady=(0, 10))
     
-    # Initial plot with default thresholds
+    # Build the figure and canvas once, then fill it with the default thresholds
+    create_plot()
+    pending_update['last'] = (60.0, 1e-4)
     update_plot(60.0, 1e-4)